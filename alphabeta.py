@@ -0,0 +1,175 @@
+# Jugador alfa-beta con profundización iterativa, pensado para Hardcore (partidas sin
+# límite de turnos, donde no se puede resolver el árbol entero).
+#
+# Negamax con poda alfa-beta y tabla de transposición (transposition.py). Las hojas
+# terminales valen su resultado exacto y las que corta la profundidad el resultado
+# exacto de colapsar ya: P(X won!) - P(O won!) sobre las probabilidades de las líneas
+# (odds.py). Cada iteración ordena primero la mejor jugada de la anterior; al llegar
+# el plazo se devuelve la mejor jugada de la última iteración completa.
+from functools import lru_cache
+from time import perf_counter
+
+from book import book_move
+from models import HALF_POW, rules_model
+from odds import board_probs
+from qengine import HARDCORE, unpack
+from transposition import EXACT, LOWER, UPPER, TranspositionTable, from_canonical, to_canonical
+
+SOLVED = 1 << 10    # profundidad con la que se guardan los valores exactos (subárbol completo)
+CHECK_EVERY = 256   # nodos entre consultas al reloj
+MASK_CELLS = tuple(tuple(cell for cell in range(9) if mask >> cell & 1) for mask in range(1 << 9))  # celdas de cada máscara legal
+
+
+class Timeout(Exception):
+    pass
+
+
+@lru_cache(maxsize=1 << 16)
+def collapse_value(codes, model=HALF_POW):
+    # P(X won!) - P(O won!) si el tablero (los códigos empaquetados de Position) colapsara ahora
+    probs = board_probs(unpack(codes), model)
+    return float(probs[1] - probs[2])
+
+
+class AlphaBetaPlayer:
+    # choose(game) -> (fila, columna), con la misma interfaz que mcts.MCTSPlayer
+    def __init__(self, rules, budget=1.0, table_size=1 << 20):
+        self.rules = rules
+        self.budget = budget
+        self.last_moves = rules['last_moves']
+        self.hardcore = rules.get('hardcore', False) or rules['max_turns'] == HARDCORE
+        self.max_turns = rules['max_turns']
+        self.model = rules_model(rules)
+        self.table = TranspositionTable(table_size)
+        self.nodes = 0
+        self.elapsed = 0.0
+        self.depths = []
+        self.book_moves = 0
+        self.deadline = 0.0
+
+    def clock(self, plies):
+        # El mismo reloj que Game.clock() para el hash
+        return min(plies, self.last_moves) if self.hardcore else self.max_turns - plies
+
+    def window(self, log):
+        return tuple(reversed(log[-self.last_moves:])) if self.last_moves else ()
+
+    def child(self, board, position, window, cell):
+        # Juega `cell` en el tablero (el llamador la deshace con unmake) y devuelve el hash
+        # y la ventana de la nueva posición
+        old, plies = board.code(cell), board.plies
+        board.make(cell)
+        new_window = ((cell,) + window)[:self.last_moves]
+        return position.child(cell, old, board.code(cell), window, new_window,
+                              self.clock(plies), self.clock(plies + 1)), new_window
+
+    def negamax(self, board, position, window, depth, alpha, beta):
+        # Valor desde el punto de vista de quien mueve
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0 and perf_counter() > self.deadline:
+            raise Timeout
+        sign = 1 if board.player == 'X' else -1
+        key, symmetry = position.canonical()
+        entry = self.table.probe(key)
+        first = None
+        limited = False  # se usó una entrada de una búsqueda cortada por la profundidad
+        if entry is not None:
+            _, stored_depth, value, bound, move = entry
+            if stored_depth >= depth:
+                limited = stored_depth < SOLVED
+                self.cutoff = self.cutoff or limited
+                if bound == EXACT:
+                    return value
+                if bound == LOWER:
+                    alpha = max(alpha, value)
+                elif bound == UPPER:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+            if move is not None:
+                first = from_canonical(move, symmetry)
+
+        legal = board.legal_mask
+        if not legal:
+            value = sign * collapse_value(board.codes, self.model)
+            self.table.store(key, SOLVED, value)
+            return value
+        if depth == 0:
+            self.cutoff = True
+            return sign * collapse_value(board.codes, self.model)
+        moves = MASK_CELLS[legal]
+        if first in moves:
+            moves = (first,) + tuple(cell for cell in moves if cell != first)
+
+        start_alpha = alpha
+        best, best_move = -2.0, None
+        # self.cutoff pasa a decir si este subárbol se cortó en algún punto
+        outer_cutoff, self.cutoff = self.cutoff, limited
+        for cell in moves:
+            child, child_window = self.child(board, position, window, cell)
+            value = -self.negamax(board, child, child_window, depth - 1, -beta, -alpha)
+            board.unmake()
+            if value > best:
+                best, best_move = value, cell
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+        solved = not self.cutoff
+        self.cutoff = self.cutoff or outer_cutoff
+        bound = UPPER if best <= start_alpha else LOWER if best >= beta else EXACT
+        self.table.store(key, SOLVED if solved else depth, best, bound, to_canonical(best_move, symmetry))
+        return best
+
+    def search(self, board, position):
+        # (celda, valor para quien mueve, profundidad completada). Un Timeout deja el
+        # tablero a medio jugar: choose busca en una copia del de la partida
+        moves = list(MASK_CELLS[board.legal_mask])
+        if not moves:
+            return None, 0.0, 0
+        window = self.window(board.log)
+        best, value, reached = moves[0], None, 0
+        depth = 0
+        try:
+            while True:
+                depth += 1
+                self.cutoff = False
+                scores = {}
+                alpha = -2.0
+                for cell in moves:
+                    child, child_window = self.child(board, position, window, cell)
+                    scores[cell] = -self.negamax(board, child, child_window, depth - 1, -2.0, -alpha)
+                    board.unmake()
+                    alpha = max(alpha, scores[cell])
+                # Mejor jugada primero en la siguiente iteración
+                moves.sort(key=lambda cell: -scores[cell])
+                best, value, reached = moves[0], scores[moves[0]], depth
+                if not self.cutoff:
+                    break  # el árbol entero cabe en esta profundidad: valor exacto
+        except Timeout:
+            pass
+        return best, value, reached
+
+    def choose(self, game):
+        if game.over():
+            raise ValueError("game is over")
+        move = book_move(game)
+        if move is not None:
+            self.book_moves += 1
+            return move
+        start = perf_counter()
+        self.deadline = start + self.budget
+        cell, _, depth = self.search(game.position.copy(), game.hash)
+        self.elapsed += perf_counter() - start
+        self.depths.append(depth)
+        return divmod(cell, 3)
+
+    def rate(self):
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    def stats(self):
+        depth = sum(self.depths) / len(self.depths) if self.depths else 0
+        return (f"{self.nodes} nodes in {self.elapsed:.1f} s, {self.rate():,.0f} nodes/s, "
+                f"mean depth {depth:.1f} (max {max(self.depths, default=0)}), {self.book_moves} book moves, {self.table}")
+
+    def close(self):
+        pass
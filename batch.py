@@ -0,0 +1,165 @@
+# Motor por lotes: N partidas con las mismas reglas en arrays contiguos de NumPy.
+# Cada jugada, la legalidad (incluida la ventana de congelación), el colapso y el
+# recuento de líneas se aplican a todas las partidas a la vez.
+#
+#   cells     (N, 9) int16   código de cada celda (ver dyadic.py y models.py)
+#   log       (N, cap) int8  celda jugada en cada turno (3*fila + columna), -1 si aún no
+#   ply       (N,) int32     jugadas hechas
+#   player    (N,) int8      a quién le toca: 0 = X, 1 = O
+#   collapsed (N, 9) int8    tras collapse(): 0 vacía ('-'), 1 X, 2 O
+import numpy as np
+
+from bitboard import OUTCOME_TABLE, TIE, X_WON, O_WON
+from dyadic import EMPTY, PURE_X, PURE_O
+from models import HALF_POW, rules_model
+from odds import outcome_probs, prob_x
+from qengine import HARDCORE
+
+X, O = 0, 1
+PURE = np.array([PURE_X, PURE_O], dtype=np.int16)
+POW3 = 3 ** np.arange(9)
+OUTCOMES = np.frombuffer(OUTCOME_TABLE, dtype=np.int8)
+DRAWS_PER_GAME = 12  # múltiplo de 4: cada paso del contador de Philox da 4 números
+
+
+def next_codes(codes, x_moves, model=HALF_POW):
+    # Nuevo código de cada celda tras una jugada de X (x_moves) u O: dos lecturas de tabla
+    return np.where(x_moves, model.table['X'][codes], model.table['O'][codes])
+
+
+class BatchGames:
+    # seed: entero o SeedSequence. De ella salen dos flujos: `rng` (PCG64) para las
+    # políticas de jugada y uno Philox para el colapso, que reserva 12 números por
+    # partida (3 bloques del contador) para poder repetir el de cualquier partida suelta.
+    def __init__(self, n, rules, capacity=None, seed=None):
+        self.n = n
+        self.xstart = rules['xstart']
+        self.max_turns = rules['max_turns']
+        self.last_moves = rules['last_moves']
+        self.hardcore = rules.get('hardcore', False) or self.max_turns == HARDCORE
+        self.model = rules_model(rules)
+        if capacity is None:
+            capacity = 64 if self.hardcore else self.max_turns
+        self.cells = np.full((n, 9), EMPTY, dtype=np.int16)
+        self.log = np.full((n, capacity), -1, dtype=np.int8)
+        self.ply = np.zeros(n, dtype=np.int32)
+        self.player = np.full(n, X if self.xstart else O, dtype=np.int8)
+        self.collapsed = None
+        self._rows = np.arange(n)
+        self.seed = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        moves_seed, self.collapse_seed = self.seed.spawn(2)
+        self.rng = np.random.default_rng(moves_seed)
+
+    @classmethod
+    def from_positions(cls, positions, rules, seed=None):
+        # Un lote en el que cada partida sigue desde su posición (códigos, celdas jugadas, jugador)
+        batch = cls(len(positions), rules, seed=seed)
+        longest = max(len(log) for _, log, _ in positions)
+        if longest >= batch.log.shape[1]:
+            batch.log = np.full((batch.n, longest + 64), -1, dtype=np.int8)
+        for game, (codes, log, player) in enumerate(positions):
+            batch.cells[game] = codes
+            batch.log[game, :len(log)] = log
+            batch.ply[game] = len(log)
+            batch.player[game] = X if player == 'X' else O
+        return batch
+
+    def turns_done(self):
+        if self.hardcore:
+            # grid_full: todas las celdas se jugaron alguna vez (una celda jugada nunca vuelve a EMPTY)
+            return (self.cells != EMPTY).all(axis=1)
+        return self.ply >= self.max_turns
+
+    def frozen(self):
+        # (N, 9) celdas dentro de las últimas `last_moves` jugadas de cada partida
+        frozen = np.zeros((self.n, 9), dtype=bool)
+        if self.last_moves:
+            # Igual que moves_log[len(moves_log)-last_moves:]: con menos jugadas que
+            # last_moves el inicio negativo del slice cuenta desde el final
+            start = self.ply - self.last_moves
+            start = np.where(start < 0, np.maximum(start + self.ply, 0), start)
+            back = self.ply[:, None] - np.arange(1, self.last_moves + 1)[None, :]
+            valid = back >= start[:, None]
+            played = self.log[self._rows[:, None], np.maximum(back, 0)]
+            rows = np.broadcast_to(self._rows[:, None], back.shape)
+            frozen[rows[valid], played[valid]] = True
+        return frozen
+
+    def legal(self):
+        # (N, 9) jugadas legales del jugador al que le toca (ninguna si la partida terminó)
+        legal = self.cells != PURE[self.player][:, None]
+        legal &= ~self.frozen()
+        legal &= ~self.turns_done()[:, None]
+        return legal
+
+    def finished(self):
+        # Terminada por turnos/cuadrícula llena, o bloqueada (quien mueve no tiene jugada legal)
+        return ~self.legal().any(axis=1)
+
+    def move(self, cells):
+        # cells: (N,) celda que juega cada partida, -1 para no mover
+        cells = np.asarray(cells)
+        moving = cells >= 0
+        rows, cols = self._rows[moving], cells[moving]
+        if not self.legal()[rows, cols].all():
+            raise ValueError("illegal move in batch")
+
+        self.cells[rows, cols] = next_codes(self.cells[rows, cols], self.player[rows] == X, self.model)
+
+        if self.ply.max(initial=0) >= self.log.shape[1]:
+            self.log = np.concatenate([self.log, np.full_like(self.log, -1)], axis=1)
+        self.log[rows, self.ply[rows]] = cols
+        self.ply[rows] += 1
+        self.player[rows] ^= 1
+
+    def random_moves(self, rng):
+        # Una jugada legal uniforme por partida (-1 en las terminadas)
+        legal = self.legal()
+        scores = np.where(legal, rng.random((self.n, 9)), -1.0)
+        cells = scores.argmax(axis=1)
+        return np.where(legal.any(axis=1), cells, -1)
+
+    def play_random(self, rng, max_plies=None):
+        # Con max_plies las partidas que llegan a esa jugada se quedan sin terminar (en
+        # Hardcore se pueden repetir celdas ocupadas sin fin)
+        while True:
+            cells = self.random_moves(rng)
+            if max_plies is not None:
+                cells[self.ply >= max_plies] = -1
+            if (cells < 0).all():
+                return
+            self.move(cells)
+
+    def prob_x(self):
+        return prob_x(self.cells, self.model)
+
+    def collapse(self, rng=None):
+        # Colapsa todas las celdas de todas las partidas con una sola llamada al generador.
+        # Sin rng usa el flujo Philox del lote y el colapso se puede repetir con collapse_draws
+        if rng is None:
+            rng = np.random.Generator(np.random.Philox(self.collapse_seed))
+            draws = rng.random((self.n, DRAWS_PER_GAME))[:, :9]
+        else:
+            draws = rng.random((self.n, 9))
+        collapsed = np.where(draws < self.prob_x(), 1, 2).astype(np.int8)
+        collapsed[self.cells == EMPTY] = 0
+        self.collapsed = collapsed
+        return collapsed
+
+    def collapse_draws(self, game):
+        # Los 9 números con los que collapse() decidió la partida `game`, sin generar los demás
+        bit_generator = np.random.Philox(self.collapse_seed)
+        bit_generator.advance(game * DRAWS_PER_GAME // 4)
+        return np.random.Generator(bit_generator).random(DRAWS_PER_GAME)[:9]
+
+    def outcomes(self):
+        # (N,) TIE, X_WON u O_WON: el tablero colapsado en base 3 indexa la tabla de bitboard.py
+        return OUTCOMES[self.collapsed @ POW3]
+
+    def odds(self):
+        # (N, 3) probabilidades exactas de Tie / X won! / O won! antes de colapsar
+        return outcome_probs(self.cells, self.model)
+
+    def tally(self):
+        counts = np.bincount(self.outcomes(), minlength=3)
+        return {'Tie': int(counts[TIE]), 'X won!': int(counts[X_WON]), 'O won!': int(counts[O_WON])}
@@ -0,0 +1,51 @@
+# Alfa-beta frente a MCTS en Hardcore (o con --standard): partidas con el mismo tiempo
+# por jugada, alternando quién lleva X. Imprime la puntuación media exacta
+# (P(X won!) - P(O won!) desde el punto de vista de alfa-beta), la profundidad
+# alcanzada, nodos/s y simulaciones/s. Antes comprueba que la tabla de transposición que
+# se conserva entre jugadas no corta la profundización iterativa a mitad de partida.
+import sys
+from os.path import dirname, abspath
+from random import Random
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from alphabeta import AlphaBetaPlayer
+from mcts import MCTSPlayer
+from qengine import Game, HARDCORE_RULES, STANDARD_RULES
+
+
+def check_depth(budget=0.3, plies=10, seed=0):
+    # Una partida Hardcore con jugadas al azar; el mismo jugador (y su tabla) busca en cada
+    # posición a mitad de partida y debe pasar de profundidad 2
+    rng = Random(seed)
+    player = AlphaBetaPlayer(HARDCORE_RULES, budget=budget)
+    game = Game(HARDCORE_RULES)
+    for _ in range(plies):
+        player.choose(game)
+        game.move(*rng.choice(game.legal_moves()))
+    assert min(player.depths[4:]) > 2, player.depths
+    print(f"hardcore depths at {budget} s/move: {player.depths}")
+
+
+def match(rules, games, budget):
+    alphabeta = AlphaBetaPlayer(rules, budget=budget)
+    mcts = MCTSPlayer(rules, budget=budget, workers=1, seed=0)
+    score = 0.0
+    for n in range(games):
+        players = {'X': alphabeta, 'O': mcts} if n % 2 == 0 else {'X': mcts, 'O': alphabeta}
+        game = Game(rules)
+        while not game.over():
+            game.move(*players[game.turn.player].choose(game))
+        odds = game.odds()
+        value = odds['X won!'] - odds['O won!']
+        score += value if players['X'] is alphabeta else -value
+    print(f"alphabeta score vs mcts: {score / games:+.3f} over {games} games ({budget} s/move)")
+    print(f"alphabeta: {alphabeta.stats()}")
+    print(f"mcts:      {mcts.stats()}")
+
+
+if __name__ == '__main__':
+    check_depth()
+    rules = STANDARD_RULES if '--standard' in sys.argv else HARDCORE_RULES
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    match(rules, int(args[0]) if args else 4, float(args[1]) if len(args) > 1 else 0.1)
@@ -0,0 +1,85 @@
+# Partidas aleatorias por segundo: una a una con qengine.Game frente a BatchGames.
+# Antes de medir comprueba que el lote reproduce a Game jugada a jugada
+# (códigos, jugadas legales, fin de partida y resultado del colapso).
+import sys
+from os.path import dirname, abspath
+from time import perf_counter
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+import numpy as np
+
+from batch import BatchGames
+from bitboard import RESULTS
+from qengine import Game, STANDARD_RULES, HARDCORE_RULES
+
+RULES = {
+    'standard': STANDARD_RULES,
+    'hardcore': HARDCORE_RULES,
+    'custom': {'xstart': False, 'max_turns': 20, 'last_moves': 4},
+}
+
+
+def check(rules, n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    batch = BatchGames(n, rules)
+    games = [Game(rules) for _ in range(n)]
+    while True:
+        legal = batch.legal()
+        for g, game in enumerate(games):
+            codes = [state.code for state in game.grid.flat]
+            assert codes == batch.cells[g].tolist()
+            moves = [3 * row + col for row, col in game.legal_moves()]
+            assert moves == np.flatnonzero(legal[g]).tolist()
+            assert game.over() == batch.finished()[g]
+        cells = batch.random_moves(rng)
+        if (cells < 0).all():
+            break
+        for game, cell in zip(games, cells):
+            if cell >= 0:
+                game.move(*divmod(int(cell), 3))
+        batch.move(cells)
+
+    # Cada partida suelta colapsa con los mismos números que le tocaron en el lote
+    collapsed = batch.collapse()
+    symbols = np.array(['-', 'X', 'O'])
+    for g, game in enumerate(games):
+        for state, draw in zip(game.grid.flat, batch.collapse_draws(g).tolist()):
+            state.collapse(draw)
+        assert [state.collapsed for state in game.grid.flat] == symbols[collapsed[g]].tolist()
+        assert game.result() == RESULTS[batch.outcomes()[g]]
+
+
+def play_single(rules, n, rng):
+    for _ in range(n):
+        game = Game(rules)
+        while not game.over():
+            moves = game.legal_moves()
+            game.move(*moves[rng.integers(len(moves))])
+        game.result()
+
+
+def play_batch(rules, n, rng):
+    batch = BatchGames(n, rules)
+    batch.play_random(rng)
+    batch.collapse()
+    return batch.tally()
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(1)
+    for name, rules in RULES.items():
+        check(rules)
+
+        n = 200
+        start = perf_counter()
+        play_single(rules, n, rng)
+        single = n / (perf_counter() - start)
+
+        n = 100_000
+        start = perf_counter()
+        tally = play_batch(rules, n, rng)
+        batched = n / (perf_counter() - start)
+
+        print(f"{name:9s} Game: {single:9.0f} games/s   BatchGames: {batched:10.0f} games/s   "
+              f"({batched / single:.0f}x)   {tally}")
@@ -0,0 +1,70 @@
+# Colapso final: una llamada a numpy.random.uniform por celda (como antes) frente a los
+# 9 números de una sola llamada al Generator de la partida, y frente al lote completo.
+import sys
+from os.path import dirname, abspath
+from time import perf_counter
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+import numpy as np
+from numpy.random import uniform
+
+from batch import BatchGames
+from dyadic import EMPTY, PURE_X, PURE_O
+from qengine import Game, STANDARD_RULES
+
+
+def final_game(seed):
+    game = Game(STANDARD_RULES, seed=seed)
+    rng = np.random.default_rng(seed)
+    while not game.over():
+        legal = game.legal_moves()
+        game.move(*legal[rng.integers(len(legal))])
+    return game
+
+
+def draws_per_cell(game):
+    # Como el State.collapse anterior: un número de la semilla global por celda en superposición
+    return [uniform(low=0.0, high=1.0, size=None) for state in game.grid.flat
+            if state.code not in (EMPTY, PURE_X, PURE_O)]
+
+
+def draws_at_once(game):
+    return game.rng.random(9).tolist()
+
+
+if __name__ == '__main__':
+    games = [final_game(seed) for seed in range(2000)]
+
+    timings = {}
+    for draws in (draws_per_cell, draws_at_once):
+        start = perf_counter()
+        for game in games:
+            draws(game)
+        timings[draws.__name__] = (perf_counter() - start) / len(games)
+    games = [final_game(seed) for seed in range(2000)]
+
+    start = perf_counter()
+    for game in games:
+        game.collapse()
+    seeded = (perf_counter() - start) / len(games)
+
+    # Con la semilla grabada el colapso se repite bit a bit
+    for game in games[:200]:
+        before = game.collapsed_grid().tolist()
+        replay = Game(STANDARD_RULES, seed=game.seed.entropy)
+        for state, original in zip(replay.grid.flat, game.grid.flat):
+            state.code = original.code
+        replay.collapse()
+        assert replay.collapsed_grid().tolist() == before
+
+    batch = BatchGames(100_000, STANDARD_RULES, seed=0)
+    batch.play_random(batch.rng)
+    start = perf_counter()
+    batch.collapse()
+    batched = (perf_counter() - start) / batch.n
+
+    print(f"draws, uniform per cell: {timings['draws_per_cell'] * 1e6:7.2f} us/game")
+    print(f"draws, one rng.random(9):{timings['draws_at_once'] * 1e6:7.2f} us/game")
+    print(f"Game.collapse (seeded):  {seeded * 1e6:7.2f} us/game")
+    print(f"BatchGames.collapse:     {batched * 1e6:7.2f} us/game")
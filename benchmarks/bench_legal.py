@@ -0,0 +1,59 @@
+# Generación de jugadas: el is_legal anterior (slice de moves_log + test `in` + probs,
+# grid_full con conjuntos) frente a la máscara de 9 bits que Game mantiene por jugada.
+import sys
+from os.path import dirname, abspath
+from time import perf_counter
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+import numpy as np
+
+from qengine import Game, grid_full, STANDARD_RULES, HARDCORE_RULES
+
+
+def sliced_legal_moves(game):
+    # Como antes de la máscara incremental
+    done = grid_full(game.moves_log) if game.hardcore else len(game.moves_log) >= game.max_turns
+    if done:
+        return []
+    frozen = game.moves_log[len(game.moves_log)-game.last_moves:] if game.last_moves else ()
+    return [(row, col) for row in range(3) for col in range(3)
+            if game.grid[row, col].collapsed is None and game.grid[row, col].probs[game.turn.player] < 1
+            and (row, col) not in frozen]
+
+
+def positions(rules, games, seed):
+    rng = np.random.default_rng(seed)
+    found = []
+    for _ in range(games):
+        game = Game(rules)
+        while not game.over():
+            found.append(game)
+            legal = game.legal_moves()
+            # Un objeto Game distinto por posición
+            replay = Game(rules)
+            for move in game.moves_log:
+                replay.move(*move)
+            game = replay
+            game.move(*legal[rng.integers(len(legal))])
+    return found
+
+
+def timed(function, games, repeat=20):
+    start = perf_counter()
+    for _ in range(repeat):
+        for game in games:
+            function(game)
+    return (perf_counter() - start) / (repeat * len(games))
+
+
+if __name__ == '__main__':
+    for name, rules in (('standard', STANDARD_RULES), ('hardcore', HARDCORE_RULES)):
+        games = positions(rules, 40, 0)
+        assert all(list(game.legal_moves()) == sliced_legal_moves(game) for game in games)
+        sliced = timed(sliced_legal_moves, games)
+        masked = timed(Game.legal_moves, games)
+        over_sliced = timed(lambda game: grid_full(game.moves_log), games)
+        over_masked = timed(Game.over, games)
+        print(f"{name:9s} legal moves: slice {sliced * 1e6:6.2f} us  mask {masked * 1e6:6.3f} us   "
+              f"end check: grid_full {over_sliced * 1e6:6.2f} us  mask {over_masked * 1e6:6.3f} us")
@@ -0,0 +1,128 @@
+# Memoria por partida viva y asignaciones por jugada: la celda anterior (atributos en __dict__
+# y un diccionario probs nuevo en cada jugada) frente a State con __slots__, y el tablero
+# compacto Position con make/unmake en sitio.
+import sys
+from os.path import dirname, abspath
+from time import perf_counter
+import tracemalloc
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+import numpy as np
+
+from batch import BatchGames
+from dyadic import EMPTY, ZERO, half_pow, cell_probs
+from qengine import Game, Position, State, TurnClass, STANDARD_RULES
+
+LIVE = 2000
+MOVES = 100_000
+
+
+class DictState:
+    # Como State antes de __slots__
+    def __init__(self, i, j):
+        self.i = i
+        self.j = j
+        self.code = EMPTY
+        self.probs = {'X': ZERO, 'O': ZERO}
+        self.on = False
+        self.collapsed = None
+
+    def move(self, turn):
+        self.code = half_pow(self.code, turn.player)
+        px, po = cell_probs(self.code)
+        self.probs = {'X': px, 'O': po}
+
+
+def live_bytes(build):
+    # Bytes que siguen reservados mientras viven LIVE objetos
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    alive = [build() for _ in range(LIVE)]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del alive
+    return size / LIVE
+
+
+def per_move(step, moves=MOVES):
+    # (µs por jugada sin trazar, bloques que quedan reservados por jugada, pico de bytes extra)
+    start = perf_counter()
+    for _ in range(moves):
+        step()
+    elapsed = perf_counter() - start
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(moves):
+        step()
+    peak = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return elapsed / moves, (sys.getallocatedblocks() - blocks) / moves, peak
+
+
+def cycle(state, turns):
+    # Estados de celda que se repiten: O y X alternando sobre la misma celda
+    index = 0
+    def step():
+        nonlocal index
+        state.move(turns[index & 1])
+        index += 1
+        if index == 16:
+            state.code, index = EMPTY, 0
+    return step
+
+
+def make_unmake(rules, seed=0):
+    # Sigue una partida aleatoria y la deshace entera antes de empezar la siguiente
+    # (cada paso es un make, o los unmake de toda la partida)
+    rng = np.random.default_rng(seed)
+    position = Position(rules)
+    choices = [rng.integers(9, size=64).tolist() for _ in range(64)]
+    game = 0
+    def step():
+        nonlocal game
+        legal = position.legal_mask
+        if legal:
+            cells = choices[game]
+            cell = cells[position.plies]
+            while not legal >> cell & 1:
+                cell = (cell + 1) % 9
+            position.make(cell)
+        else:
+            while position.plies:
+                position.unmake()
+            game = (game + 1) % 64
+    return step
+
+
+if __name__ == '__main__':
+    x, o = TurnClass(True), TurnClass(False)
+    grids = {
+        'dict State grid': lambda: np.array([[DictState(i, j) for j in range(3)] for i in range(3)]),
+        'slots State grid': lambda: np.array([[State(i, j) for j in range(3)] for i in range(3)]),
+        'Game': lambda: Game(STANDARD_RULES),
+        'Position': lambda: Position(STANDARD_RULES),
+    }
+    for name, build in grids.items():
+        print(f"{name:17s} {live_bytes(build):8.0f} bytes per live game")
+    batch = BatchGames(LIVE, STANDARD_RULES)
+    print(f"{'BatchGames row':17s} {(batch.cells.nbytes + batch.log.nbytes) / LIVE:8.0f} bytes per live game")
+    print()
+
+    for name, state in (('dict State.move', DictState(0, 0)), ('slots State.move', State(0, 0))):
+        elapsed, blocks, peak = per_move(cycle(state, (x, o)))
+        print(f"{name:17s} {elapsed * 1e6:6.3f} us/move  {blocks:6.3f} blocks kept/move  peak {peak:6d} bytes")
+
+    elapsed, blocks, peak = per_move(make_unmake(STANDARD_RULES))
+    print(f"{'make/unmake':17s} {elapsed * 1e6:6.3f} us/move  {blocks:6.3f} blocks kept/move  peak {peak:6d} bytes")
+
+    # Game.move también actualiza el hash de Zobrist y el tracker de líneas
+    games = [Game(STANDARD_RULES) for _ in range(2 * MOVES // 13 + 2)]
+    playing = iter(games)
+    def game_move(game=[None]):
+        if game[0] is None or game[0].over():
+            game[0] = next(playing)
+        game[0].move(*game[0].legal_moves()[0])
+    elapsed, _, _ = per_move(game_move)
+    print(f"{'Game.move':17s} {elapsed * 1e6:6.3f} us/move")
@@ -0,0 +1,100 @@
+# Coste por jugada de cada modelo de peso registrado en models.py: State.move, make/unmake
+# de Position y BatchGames, todos leyendo la tabla de transiciones del modelo, frente a la
+# función half_pow con sus ramas. Comprueba también el modelo counter contra la fórmula
+# del cuaderno (coeficientes x/sqrt(x² + o²)).
+import sys
+from os.path import dirname, abspath
+from random import Random
+from time import perf_counter
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from batch import BatchGames
+from dyadic import EMPTY, PURE_X, PURE_O, half_pow
+from models import MODELS, COUNTER, COUNT_BITS, MAX_COUNT
+from qengine import Position, State, TurnClass, STANDARD_RULES
+
+
+def random_sequences(model, n, length, seed=0):
+    # Secuencias legales de jugadores sobre una sola celda
+    rng = Random(seed)
+    sequences = []
+    for _ in range(n):
+        code, seq = EMPTY, []
+        while len(seq) < length:
+            player = rng.choice('XO')
+            if code != (PURE_X if player == 'X' else PURE_O):
+                code = model.next[player][code]
+                seq.append(player)
+        sequences.append(seq)
+    return sequences
+
+
+def check_counter(sequences):
+    import sympy as sp
+    for seq in sequences:
+        state, counts = State(0, 0, COUNTER), {'X': 0, 'O': 0}
+        for player in seq:
+            state.move(TurnClass(player == 'X'))
+            counts[player] += 1
+            norm = sp.sqrt(counts['X']**2 + counts['O']**2)
+            for p in 'XO':
+                assert sp.simplify(sp.sympify(str(state.coefs[p])) - counts[p] / norm) == 0
+        x, o = state.code >> COUNT_BITS, state.code & MAX_COUNT
+        assert (x, o) == (counts['X'], counts['O']) or state.code in (PURE_X, PURE_O)
+
+
+def timed_moves(step, sequences):
+    turns = {'X': TurnClass(True), 'O': TurnClass(False)}
+    sequences = [[turns[player] for player in seq] for seq in sequences]
+    start = perf_counter()
+    for seq in sequences:
+        step(seq)
+    return (perf_counter() - start) / sum(len(seq) for seq in sequences)
+
+
+def branchy(seq):
+    # La jugada como antes de las tablas: half_pow con sus ramas
+    code = EMPTY
+    for turn in seq:
+        code = half_pow(code, turn.player)
+
+
+def state_moves(model):
+    def step(seq):
+        state = State(0, 0, model)
+        for turn in seq:
+            state.move(turn)
+    return step
+
+
+def make_unmake(rules, games=2000, seed=0):
+    rng = Random(seed)
+    position = Position(rules)
+    moves = 0
+    start = perf_counter()
+    for _ in range(games):
+        while position.legal_mask:
+            legal = [cell for cell in range(9) if position.legal_mask >> cell & 1]
+            position.make(legal[rng.randrange(len(legal))])
+            moves += 1
+        while position.plies:
+            position.unmake()
+    return (perf_counter() - start) / moves
+
+
+def batch_moves(rules, n=20_000):
+    batch = BatchGames(n, rules, seed=0)
+    start = perf_counter()
+    batch.play_random(batch.rng)
+    return (perf_counter() - start) / batch.ply.sum()
+
+
+if __name__ == '__main__':
+    check_counter(random_sequences(COUNTER, 20, 12))
+    print(f"{'half_pow() branches':20s} State.move {timed_moves(branchy, random_sequences(MODELS['half_pow'], 500, 30)) * 1e6:6.3f} us")
+    for name, model in MODELS.items():
+        rules = dict(STANDARD_RULES, w_model=name)
+        moves = timed_moves(state_moves(model), random_sequences(model, 500, 30))
+        print(f"{name:20s} State.move {moves * 1e6:6.3f} us  make/unmake {make_unmake(rules) * 1e6:6.3f} us  "
+              f"BatchGames {batch_moves(rules) * 1e9:6.1f} ns  (per move)")
@@ -0,0 +1,88 @@
+# Coste por jugada de State.move: camino sympy original frente al núcleo diádico exacto.
+# Comprueba también que ambos dan exactamente las mismas probabilidades y coeficientes.
+import sys
+from os.path import dirname, abspath
+from random import Random
+from time import perf_counter
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from dyadic import EMPTY, PURE_X, PURE_O, half_pow, cell_probs
+
+
+def sympy_move(probs, player, inactive):
+    # State.move(turn, w_model='half_pow') tal como era con sympy
+    from sympy import Rational, sqrt
+    if probs[player] == 0:
+        if probs[inactive] == 0:
+            probs[player] = 1
+        else:
+            probs = {'X':  Rational(1/2), 'O':  Rational(1/2)}
+    else:
+        if probs[player] >= probs[inactive]:
+            probs[inactive] =  Rational(probs[inactive]/2)
+            probs[player] = 1 - probs[inactive]
+        else:
+            probs[player] =  Rational(probs[player]*2)
+            probs[inactive] = 1 - probs[player]
+    coefs = {player: sqrt(probs[player]), inactive: sqrt(probs[inactive])}
+    return probs, coefs
+
+
+def dyadic_move(code, player):
+    code = half_pow(code, player)
+    px, po = cell_probs(code)
+    return code, {'X': px, 'O': po}
+
+
+def random_sequences(n, length, seed=0):
+    # Secuencias legales de jugadores sobre una sola celda
+    rng = Random(seed)
+    sequences = []
+    for _ in range(n):
+        code, seq = EMPTY, []
+        while len(seq) < length:
+            player = rng.choice('XO')
+            if code != (PURE_X if player == 'X' else PURE_O):
+                code = half_pow(code, player)
+                seq.append(player)
+        sequences.append(seq)
+    return sequences
+
+
+def main(n=200, length=30):
+    from sympy import latex
+    sequences = random_sequences(n, length)
+
+    for seq in sequences[:50]:
+        probs, code = {'X': 0, 'O': 0}, EMPTY
+        for player in seq:
+            inactive = 'O' if player == 'X' else 'X'
+            probs, coefs = sympy_move(probs, player, inactive)
+            code, dprobs = dyadic_move(code, player)
+            for p in 'XO':
+                assert str(dprobs[p]) == str(probs[p])
+                assert str(dprobs[p].sqrt()) == str(coefs[p])
+                assert dprobs[p].sqrt().latex() == latex(coefs[p])
+
+    start = perf_counter()
+    for seq in sequences:
+        probs = {'X': 0, 'O': 0}
+        for player in seq:
+            probs, _ = sympy_move(probs, player, 'O' if player == 'X' else 'X')
+    sympy_time = (perf_counter() - start) / (n * length)
+
+    start = perf_counter()
+    for seq in sequences:
+        code = EMPTY
+        for player in seq:
+            code, _ = dyadic_move(code, player)
+    dyadic_time = (perf_counter() - start) / (n * length)
+
+    print(f"sympy:  {sympy_time * 1e6:.2f} us/move")
+    print(f"dyadic: {dyadic_time * 1e6:.2f} us/move")
+    print(f"speedup: {sympy_time / dyadic_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
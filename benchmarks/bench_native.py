@@ -0,0 +1,41 @@
+# Coste de dibujar los coeficientes de un tablero completo con glifos nativos
+# (fuentes y líneas de pygame) frente a mathtext, con la cache vacía y llena.
+import sys
+from os import environ
+from os.path import dirname, abspath
+from random import Random
+from time import perf_counter
+
+environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from headless import HeadlessRenderer, random_board
+
+
+def per_board(view, boards, clear):
+    start = perf_counter()
+    for grid in boards:
+        if clear:
+            view.glyph_cache.clear()
+        view.draw_state(grid)
+    return (perf_counter() - start) / len(boards)
+
+
+def main(n=200):
+    rng = Random(0)
+    boards = [random_board(rng) for _ in range(n)]
+
+    native = HeadlessRenderer('native').view
+    mathtext = HeadlessRenderer('mathtext').view
+    mathtext.atlas = None  # Medir matplotlib, no el atlas
+    per_board(native, boards[:5], True)
+    per_board(mathtext, boards[:1], True)
+
+    print(f"native, empty cache:   {per_board(native, boards, True) * 1e3:8.3f} ms/board")
+    print(f"native, warm cache:    {per_board(native, boards, False) * 1e3:8.3f} ms/board")
+    print(f"mathtext, empty cache: {per_board(mathtext, boards[:3], True) * 1e3:8.3f} ms/board")
+    print(f"matplotlib imported: {'matplotlib' in sys.modules} (only by the mathtext view)")
+
+
+if __name__ == "__main__":
+    main()
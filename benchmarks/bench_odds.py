@@ -0,0 +1,79 @@
+# Probabilidades exactas de cada resultado: odds.outcome_probs frente a una enumeración
+# con fracciones (referencia) y frente a estimarlas colapsando muchas veces.
+import sys
+from fractions import Fraction
+from itertools import product
+from os.path import dirname, abspath
+from time import perf_counter
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+import numpy as np
+
+from batch import BatchGames
+from bitboard import outcome
+from dyadic import EMPTY, cell_probs
+from odds import board_probs, outcome_probs
+from qengine import STANDARD_RULES
+
+
+def fraction_probs(codes):
+    # Referencia lenta y exacta: las 2**k combinaciones de las celdas jugadas
+    played = [cell for cell in range(9) if codes[cell] != EMPTY]
+    probs = [Fraction(0)] * 3
+    for values in product('XO', repeat=len(played)):
+        weight = Fraction(1)
+        xmask = omask = 0
+        for cell, value in zip(played, values):
+            px, po = cell_probs(codes[cell])
+            p = px if value == 'X' else po
+            weight *= Fraction(p.num, 2 ** p.exp)
+            if value == 'X':
+                xmask |= 1 << cell
+            else:
+                omask |= 1 << cell
+        probs[outcome(xmask, omask)] += weight
+    return probs
+
+
+def final_boards(n, seed):
+    batch = BatchGames(n, STANDARD_RULES)
+    batch.play_random(np.random.default_rng(seed))
+    return batch
+
+
+if __name__ == '__main__':
+    batch = final_boards(200, 0)
+    fast = outcome_probs(batch.cells)
+    start = perf_counter()
+    for codes, row in zip(batch.cells.tolist(), fast):
+        exact = fraction_probs(codes)
+        assert np.allclose(row, [float(p) for p in exact], rtol=0, atol=1e-15)
+        assert np.allclose(board_probs(codes), row, rtol=0, atol=1e-15)
+    reference = (perf_counter() - start) / len(batch.cells)
+    assert np.allclose(fast.sum(axis=1), 1)
+
+    single = batch.cells[0].tolist()
+    start = perf_counter()
+    for _ in range(1000):
+        board_probs(single)
+    one = (perf_counter() - start) / 1000
+
+    batch = final_boards(100_000, 1)
+    start = perf_counter()
+    probs = outcome_probs(batch.cells)
+    many = (perf_counter() - start) / len(batch.cells)
+
+    rng = np.random.default_rng(2)
+    sampled = np.zeros(3)
+    samples = 20
+    for _ in range(samples):
+        batch.collapse(rng)
+        sampled += np.bincount(batch.outcomes(), minlength=3)
+    sampled /= samples * len(batch.cells)
+
+    print(f"fractions:            {reference * 1e6:9.1f} us/board")
+    print(f"board_probs:          {one * 1e6:9.1f} us/board")
+    print(f"outcome_probs (batch):{many * 1e6:9.2f} us/board")
+    print(f"mean exact   Tie/X/O: {np.round(probs.mean(axis=0), 4)}")
+    print(f"mean sampled Tie/X/O: {np.round(sampled, 4)}")
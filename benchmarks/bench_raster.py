@@ -0,0 +1,52 @@
+# Latencia por glifo de los dos caminos de rasterizado de render_latex:
+# 'png' (figura nueva y PNG temporal en disco, como antes) frente a 'buffer' (una figura
+# y canvas Agg reutilizados entre glifos -> Surface en memoria)
+import sys
+from os import environ
+from os.path import dirname, abspath
+from time import perf_counter
+
+environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+import pygame
+from glyphs import render_latex
+
+EXPRESSIONS = [
+    (["1|X\\rangle"], ['red']),
+    (["\\frac{\\sqrt{2}}{2}|X\\rangle", ' + ', "\\frac{\\sqrt{2}}{2}|O\\rangle"], ['red', 'black', 'blue']),
+    (["\\frac{\\sqrt{3}}{2}|X\\rangle", ' + ', "\\frac{1}{2}|O\\rangle"], ['red', 'black', 'blue']),
+    (["\\frac{\\sqrt{14}}{4}|X\\rangle", ' + ', "\\frac{\\sqrt{2}}{4}|O\\rangle"], ['red', 'black', 'blue']),
+]
+
+
+def bench(raster, rounds):
+    start = perf_counter()
+    for _ in range(rounds):
+        for expression, colors in EXPRESSIONS:
+            render_latex(expression, colors, fontsize=20, raster=raster)
+    return (perf_counter() - start) / (rounds * len(EXPRESSIONS))
+
+
+def main(rounds=25):
+    pygame.init()
+    pygame.display.set_mode((600, 700))
+
+    # Ambos caminos deben producir exactamente los mismos pixeles
+    for expression, colors in EXPRESSIONS:
+        png = render_latex(expression, colors, fontsize=20, raster='png')
+        buf = render_latex(expression, colors, fontsize=20, raster='buffer')
+        assert png.get_size() == buf.get_size()
+        assert pygame.image.tobytes(png, 'RGBA') == pygame.image.tobytes(buf, 'RGBA')
+
+    bench('buffer', 2)  # calentamiento (fuentes de mathtext)
+    png = bench('png', rounds)
+    buf = bench('buffer', rounds)
+    print(f"png:    {png * 1e3:.2f} ms/glyph")
+    print(f"buffer: {buf * 1e3:.2f} ms/glyph")
+    print(f"speedup: {png / buf:.2f}x")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 25)
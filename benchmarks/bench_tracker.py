@@ -0,0 +1,53 @@
+# Coste por jugada de tener al día las probabilidades: LineTracker (solo las líneas de
+# la celda jugada, resultados memorizados) frente a recalcularlo todo tras cada jugada.
+import sys
+from os.path import dirname, abspath
+from time import perf_counter
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+import numpy as np
+
+from bitboard import LINE_CELLS
+from dyadic import cell_probs
+from odds import board_codes, odds
+from qengine import Game, STANDARD_RULES
+
+
+def lines_from_scratch(game):
+    codes = board_codes(game.grid)
+    px = [float(cell_probs(code)[0]) for code in codes]
+    po = [float(cell_probs(code)[1]) for code in codes]
+    xlines = sum(px[a] * px[b] * px[c] for a, b, c in LINE_CELLS)
+    olines = sum(po[a] * po[b] * po[c] for a, b, c in LINE_CELLS)
+    return xlines, olines
+
+
+def play(games, seed, analyse):
+    rng = np.random.default_rng(seed)
+    moves = 0
+    start = perf_counter()
+    for _ in range(games):
+        game = Game(STANDARD_RULES)
+        while not game.over():
+            legal = game.legal_moves()
+            game.move(*legal[rng.integers(len(legal))])
+            analyse(game)
+            moves += 1
+    return (perf_counter() - start) / moves
+
+
+if __name__ == '__main__':
+    # Game.move ya actualiza el tracker, así que su coste va incluido en 'moves only'
+    baseline = play(300, 0, lambda game: None)
+    rows = [
+        ('expected lines, recomputed', play(300, 0, lines_from_scratch)),
+        ('expected lines, tracked', play(300, 0, lambda game: game.expected_lines())),
+        ('exact odds, recomputed', play(300, 0, lambda game: odds(game.grid))),
+        # Mismas partidas otra vez: los tableros repetidos salen de la caché
+        ('exact odds, tracked (cold)', play(300, 1, lambda game: game.odds())),
+        ('exact odds, tracked (warm)', play(300, 1, lambda game: game.odds())),
+    ]
+    print(f"{'moves only':28s} {baseline * 1e6:7.1f} us/move")
+    for label, cost in rows:
+        print(f"{label:28s} {(cost - baseline) * 1e6:7.1f} us/move extra")
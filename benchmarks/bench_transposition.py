@@ -0,0 +1,77 @@
+# Transposiciones en el árbol de juego con las reglas estándar: recorre todas las
+# partidas hasta una profundidad y compara los nodos visitados sin tabla, con tabla
+# por hash exacto y con tabla por hash canónico (8 simetrías). Comprueba además que
+# hash canónico y posición canónica exacta coinciden uno a uno (sin colisiones).
+import sys
+from os.path import dirname, abspath
+from time import perf_counter
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from dyadic import EMPTY, PURE_X, PURE_O, half_pow
+from qengine import STANDARD_RULES
+from transposition import SYMMETRIES, PositionHash, TranspositionTable
+
+MAX_TURNS, LAST_MOVES = STANDARD_RULES['max_turns'], STANDARD_RULES['last_moves']
+
+
+def children(codes, log, player):
+    frozen = log[len(log)-LAST_MOVES:] if LAST_MOVES else ()
+    pure = PURE_X if player == 'X' else PURE_O
+    for cell in range(9):
+        if codes[cell] != pure and cell not in frozen:
+            new = list(codes)
+            new[cell] = half_pow(codes[cell], player)
+            yield cell, tuple(new), log + (cell,)
+
+
+def window(log):
+    return tuple(reversed(log[-LAST_MOVES:])) if LAST_MOVES else ()
+
+
+def exact_canonical(codes, log, player):
+    return min((tuple(codes[perm.index(cell)] for cell in range(9)),
+                tuple(perm[cell] for cell in window(log)), player, len(log)) for perm in SYMMETRIES)
+
+
+def search(depth, table=None, canonical=False, seen=None):
+    def visit(codes, log, player, position, remaining):
+        nodes_here = 1
+        if table is not None:
+            key = position.canonical()[0] if canonical else position.key
+            if seen is not None:
+                seen.setdefault(key, exact_canonical(codes, log, player))
+                assert seen[key] == exact_canonical(codes, log, player), "hash collision"
+            entry = table.probe(key)
+            if entry is not None and entry[1] >= remaining:
+                return nodes_here
+        if remaining:
+            other = 'O' if player == 'X' else 'X'
+            for cell, new_codes, new_log in children(codes, log, player):
+                child = position.copy()
+                child.set_cell(cell, codes[cell], new_codes[cell])
+                child.set_window(window(log), window(new_log))
+                child.set_clock(MAX_TURNS - len(log), MAX_TURNS - len(new_log))
+                child.switch_side()
+                nodes_here += visit(new_codes, new_log, other, child, remaining - 1)
+        if table is not None:
+            table.store(key, remaining, 0)
+        return nodes_here
+
+    start = PositionHash([EMPTY] * 9, (), False, MAX_TURNS)
+    return visit((EMPTY,) * 9, (), 'X', start, depth)
+
+
+if __name__ == '__main__':
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    start = perf_counter()
+    plain = search(depth)
+    print(f"no table:        {plain:9d} nodes  {perf_counter() - start:6.2f} s")
+    for canonical in (False, True):
+        table = TranspositionTable(1 << 18)
+        seen = {} if canonical else None
+        start = perf_counter()
+        nodes = search(depth, table, canonical, seen)
+        label = 'canonical hash:' if canonical else 'exact hash:'
+        print(f"{label:16s} {nodes:9d} nodes  {perf_counter() - start:6.2f} s  {table}")
+    print(f"distinct canonical positions: {len(seen)} (no collisions)")
@@ -0,0 +1,70 @@
+# check_winners: versión original con arrays de NumPy frente a las máscaras de bits
+# (conteo con popcount y tabla de los 3**9 tableros). Comprueba que coinciden en todos.
+import sys
+from itertools import product
+from os.path import dirname, abspath
+from time import perf_counter
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from numpy import array, all, fliplr
+
+from bitboard import masks, winner, winner_lookup
+
+
+def numpy_check_winners(grid):
+    # check_winners tal como era antes de bitboard.py
+    Xwins = 0
+    Owins = 0
+    for i in range(3):
+        row = grid[i, :]
+        if all(row == 'X'):
+            Xwins += 1
+        elif all(row == 'O'):
+            Owins += 1
+    for j in range(3):
+        col = grid[:, j]
+        if all(col == 'X'):
+            Xwins += 1
+        elif all(col == 'O'):
+            Owins += 1
+    diagonal = grid.diagonal()
+    antidiagonal = fliplr(grid).diagonal()
+    if all(diagonal == 'X'):
+        Xwins += 1
+    elif all(diagonal == 'O'):
+        Owins += 1
+    if all(antidiagonal == 'X'):
+        Xwins += 1
+    elif all(antidiagonal == 'O'):
+        Owins += 1
+    if Owins==Xwins:
+        return 'Tie'
+    if Owins<Xwins:
+        return 'X won!'
+    if Owins>Xwins:
+        return 'O won!'
+
+
+def timed(function, boards):
+    start = perf_counter()
+    for board in boards:
+        function(*board)
+    return (perf_counter() - start) / len(boards)
+
+
+def main():
+    grids = [array(cells, dtype=object).reshape(3, 3) for cells in product('-XO', repeat=9)]
+    bitboards = [masks(grid) for grid in grids]
+    for grid, (xmask, omask) in zip(grids, bitboards):
+        expected = numpy_check_winners(grid)
+        assert winner(xmask, omask) == expected and winner_lookup(xmask, omask) == expected
+    print(f"all {len(grids)} boards agree")
+
+    print(f"numpy:    {timed(numpy_check_winners, [(g,) for g in grids[::10]]) * 1e6:8.3f} us/board")
+    print(f"popcount: {timed(winner, bitboards) * 1e6:8.3f} us/board")
+    print(f"table:    {timed(winner_lookup, bitboards) * 1e6:8.3f} us/board")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Tablero colapsado como dos máscaras de 9 bits (una para X y otra para O).
+# La celda (i, j) es el bit 3*i + j.
+RESULTS = ('Tie', 'X won!', 'O won!')
+TIE, X_WON, O_WON = 0, 1, 2
+
+LINES = (
+    0b000000111, 0b000111000, 0b111000000,  # filas
+    0b001001001, 0b010010010, 0b100100100,  # columnas
+    0b100010001, 0b001010100,               # diagonales
+)
+
+# Celdas de cada línea y líneas que pasan por cada celda
+LINE_CELLS = tuple(tuple(cell for cell in range(9) if line >> cell & 1) for line in LINES)
+CELL_LINES = tuple(tuple(n for n, line in enumerate(LINES) if line >> cell & 1) for cell in range(9))
+
+
+def bit(row, col):
+    return 1 << (3 * row + col)
+
+
+def masks(grid):
+    # (máscara X, máscara O) de una cuadrícula 3x3 de 'X'/'O'/'-' (o de celdas con .collapsed)
+    xmask = omask = 0
+    for cell, value in enumerate(grid.flat):
+        value = getattr(value, 'collapsed', value)
+        if value == 'X':
+            xmask |= 1 << cell
+        elif value == 'O':
+            omask |= 1 << cell
+    return xmask, omask
+
+
+def completed(mask):
+    # Máscara de 8 bits con las líneas completas de `mask`
+    done = 0
+    for n, line in enumerate(LINES):
+        if mask & line == line:
+            done |= 1 << n
+    return done
+
+
+def count_lines(xmask, omask):
+    return completed(xmask).bit_count(), completed(omask).bit_count()
+
+
+def outcome(xmask, omask):
+    # TIE, X_WON u O_WON: gana quien complete más líneas
+    xwins, owins = count_lines(xmask, omask)
+    return TIE if xwins == owins else (X_WON if xwins > owins else O_WON)
+
+
+def winner(xmask, omask):
+    return RESULTS[outcome(xmask, omask)]
+
+
+# Variante por tabla: cada tablero colapsado es un número en base 3 (0 vacía, 1 X, 2 O)
+# y su resultado se precalcula para los 3**9 tableros
+TERNARY = tuple(sum(3 ** cell for cell in range(9) if mask >> cell & 1) for mask in range(512))
+
+
+def _build_table():
+    table = bytearray(3 ** 9)
+    line_counts = [completed(mask).bit_count() for mask in range(512)]
+    for xmask in range(512):
+        free = 511 & ~xmask
+        omask = free
+        xwins = line_counts[xmask]
+        while True:  # todos los subconjuntos de las celdas libres
+            owins = line_counts[omask]
+            table[TERNARY[xmask] + 2 * TERNARY[omask]] = TIE if xwins == owins else (X_WON if xwins > owins else O_WON)
+            if omask == 0:
+                break
+            omask = (omask - 1) & free
+    return bytes(table)
+
+
+OUTCOME_TABLE = _build_table()
+
+
+def outcome_lookup(xmask, omask):
+    return OUTCOME_TABLE[TERNARY[xmask] + 2 * TERNARY[omask]]
+
+
+def winner_lookup(xmask, omask):
+    return RESULTS[OUTCOME_TABLE[TERNARY[xmask] + 2 * TERNARY[omask]]]
@@ -0,0 +1,144 @@
+import pygame
+
+from os.path import dirname, abspath, isfile, join
+from glyphs import GlyphCache, GlyphAtlas, atlas_key, ket_expression, render_latex, render_native, text_cache
+
+ATLAS_INDEX = join(dirname(abspath(__file__)), 'assets', 'coef_atlas.json')
+
+# Dimensiones de la ventana
+WIDTH, HEIGHT = 600, 600+100
+
+# Colores
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+GRAY = (200, 200, 200)
+DARK_GRAY = (100, 100, 100)
+
+# Dimensiones de la cuadrícula
+GRID_SIZE = 3
+CELL_SIZE = WIDTH // GRID_SIZE
+
+
+class BoardView:
+    # Dibujo del tablero sobre cualquier Surface: la ventana del juego o una offscreen.
+    # glyphs='mathtext' usa el atlas y matplotlib para lo que falte; glyphs='native'
+    # dibuja los coeficientes con fuentes y líneas de pygame, sin matplotlib.
+    def __init__(self, surface, font=None, smallfont=None, glyphs='mathtext'):
+        self.surface = surface
+        self.font = font or pygame.font.SysFont("comicsans", 40)
+        self.smallfont = smallfont or pygame.font.SysFont("comicsans", 25)
+        self.glyphs = glyphs
+
+        # Atlas precalculado de coeficientes (build_atlas.py); lo que no esté se renderiza
+        # y queda en la cache, indexada por (prob X, prob O)
+        self.atlas = GlyphAtlas.load(ATLAS_INDEX) if glyphs == 'mathtext' and isfile(ATLAS_INDEX) else None
+        self.glyph_cache = GlyphCache()
+
+    def draw_turn(self, player, progress):
+        turn_text = f"Turn: {player}"
+        text_1 =   text_cache.render(self.smallfont, turn_text, 1, BLACK)
+        self.surface.blit(text_1, (WIDTH // 2 - text_1.get_width() // 2-150, 10))
+
+        if progress == '>:3':
+            progress_text = progress
+        else:
+            progress_text = f"Progress: {progress[0]}/{progress[1]}"
+
+        text_2 = text_cache.render(self.smallfont, progress_text, 1, BLACK)
+        self.surface.blit(text_2, (WIDTH // 2 - text_2.get_width() // 2+150, 10))
+
+    def draw_winner(self, winner):
+        winner_text = f"{winner}"
+        text = text_cache.render(self.font, winner_text, 1, BLACK)
+        self.surface.blit(text, (WIDTH // 2 - text.get_width() // 2, 10))
+
+    def draw_grid(self):
+        self.surface.fill(WHITE)
+        for x in range(1, GRID_SIZE):
+            pygame.draw.line(self.surface, BLACK, (x * CELL_SIZE, 100), (x * CELL_SIZE, HEIGHT), 3)
+            pygame.draw.line(self.surface, BLACK, (0, x * CELL_SIZE+100), (WIDTH, x * CELL_SIZE+100), 3)
+
+    def cell_glyph(self, state):
+        # Imagen y posición de una celda (None si está vacía)
+        i, j = state.i, state.j
+        if state.collapsed:
+            text = text_cache.render(self.font, state.collapsed, 1, RED if state.collapsed == 'X' else BLUE)
+            return text, (j * CELL_SIZE + CELL_SIZE // 3, i * CELL_SIZE + CELL_SIZE // 4+100)
+        key = (state.probs['X'], state.probs['O'])
+        if key != (0, 0):  # Si hay algo que mostrar
+            img = self.atlas.get(atlas_key(*key)) if self.atlas else None
+            if img is None:
+                img = self.glyph_cache.get(key, lambda: self.render_coefs(state.coefs))
+            return img, (j * CELL_SIZE + 10, i * CELL_SIZE + 20+100)
+        return None
+
+    def draw_state(self, grid):
+        for state in grid.flat:
+            glyph = self.cell_glyph(state)
+            if glyph:
+                self.surface.blit(*glyph)
+
+    def render_coefs(self, coefs):
+        if self.glyphs == 'native':
+            return render_native([(coefs[label].parts(), label) for label in 'XO' if coefs[label] != 0])
+        # Generar la expresión LaTeX solo con los kets con coeficientes no nulos
+        expression, colors = ket_expression(coefs['X'].latex() if coefs['X'] != 0 else None,
+                                            coefs['O'].latex() if coefs['O'] != 0 else None)
+        return render_latex(expression,colors, fontsize=20)
+
+
+class BoardRenderer:
+    # Redibuja solo las celdas y la cabecera que cambiaron desde el último frame.
+    # El fondo (cuadrícula) se dibuja una vez y se guarda en una Surface.
+    HEADER = pygame.Rect(0, 0, WIDTH, 100)
+
+    def __init__(self, view):
+        self.view = view
+        view.draw_grid()
+        self.background = view.surface.copy()
+        self.cells = {}     # (i, j) -> (key, imagen, rect) de lo último dibujado
+        self.header = None
+        self.full = True
+
+    def render(self, grid, header=None, draw_header=None):
+        # Devuelve la lista de rects sucios para pygame.display.update
+        surface = self.view.surface
+        dirty = []
+        if self.full:
+            surface.blit(self.background, (0, 0))
+            dirty.append(surface.get_rect())
+
+        if header != self.header or self.full:
+            surface.blit(self.background, self.HEADER, self.HEADER)
+            if draw_header is not None:
+                draw_header()
+            self.header = header
+            dirty.append(self.HEADER)
+
+        regions = []
+        for state in grid.flat:
+            key = (state.collapsed, state.probs['X'], state.probs['O'])
+            old = self.cells.get((state.i, state.j))
+            if old is not None and old[0] == key and not self.full:
+                continue
+            glyph = self.view.cell_glyph(state)
+            img, rect = (glyph[0], pygame.Rect(glyph[1], glyph[0].get_size())) if glyph else (None, None)
+            self.cells[(state.i, state.j)] = (key, img, rect)
+            # Zona a limpiar: lo que ocupaba antes y lo que ocupa ahora
+            region = [r for r in (old and old[2], rect) if r]
+            if region:
+                regions.append(region[0].unionall(region[1:]))
+        self.full = False
+
+        # Los glifos anchos invaden celdas vecinas: se repintan todas las que tocan la zona
+        for region in regions:
+            surface.blit(self.background, region, region)
+            surface.set_clip(region)
+            for _, img, rect in self.cells.values():
+                if img is not None and rect.colliderect(region):
+                    surface.blit(img, rect)
+            surface.set_clip(None)
+            dirty.append(region)
+        return dirty
@@ -0,0 +1,59 @@
+# Libro de aperturas para las reglas estándar: la jugada óptima (según solver.py) de
+# cada posición de los primeros turnos, una sola vez por clase de simetría. Se genera
+# con build_book.py y se carga la primera vez que se consulta.
+from os.path import dirname, abspath, exists, join
+
+import numpy as np
+
+from models import HALF_POW
+from qengine import STANDARD_RULES
+from transposition import from_canonical
+
+BOOK_PATH = join(dirname(abspath(__file__)), 'assets', 'opening_book.npz')
+
+
+class OpeningBook:
+    # Fichero: claves canónicas (uint64), jugada en el marco canónico (uint8) y valor (float32)
+    def __init__(self, path=BOOK_PATH, rules=STANDARD_RULES):
+        self.path = path
+        self.rules = rules
+        self.moves = None
+        self.values = None
+
+    def load(self):
+        self.moves, self.values = {}, {}
+        if exists(self.path):
+            data = np.load(self.path)
+            keys = data['keys'].tolist()
+            self.moves = dict(zip(keys, data['moves'].tolist()))
+            self.values = dict(zip(keys, data['values'].tolist()))
+
+    def covers(self, game):
+        return (not game.hardcore and game.model is HALF_POW and game.xstart == self.rules['xstart']
+                and game.max_turns == self.rules['max_turns'] and game.last_moves == self.rules['last_moves'])
+
+    def lookup(self, game):
+        # ((fila, columna), valor) si la posición está en el libro, si no None
+        if not self.covers(game):
+            return None
+        if self.moves is None:
+            self.load()
+        key, symmetry = game.position_key()
+        move = self.moves.get(key)
+        if move is None:
+            return None
+        return divmod(from_canonical(move, symmetry), 3), self.values[key]
+
+    def __len__(self):
+        if self.moves is None:
+            self.load()
+        return len(self.moves)
+
+
+standard_book = OpeningBook()
+
+
+def book_move(game):
+    # Jugada del libro estándar para `game`, o None fuera del libro
+    entry = standard_book.lookup(game)
+    return entry[0] if entry else None
@@ -0,0 +1,80 @@
+# Paso offline: enumera todos los estados de celda alcanzables con el modelo
+# half_pow en MAX_TURNS turnos, renderiza cada etiqueta una sola vez y las empaqueta
+# en assets/coef_atlas.png + assets/coef_atlas.json.
+#   python build_atlas.py [max_turns]
+from json import dump as jsondump
+from os import environ
+from os.path import dirname, abspath, join
+from sys import argv
+
+environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from dyadic import EMPTY, PURE_X, PURE_O, half_pow, cell_probs
+from glyphs import atlas_key, ket_expression, render_latex
+
+MAX_TURNS = 30
+ATLAS_WIDTH = 1024
+ASSETS = join(dirname(abspath(__file__)), 'assets')
+
+
+def reachable_states(max_turns):
+    # BFS sobre los estados de una celda: cada turno la celda puede jugarla X u O
+    # (si su probabilidad es < 1) o no tocarse
+    seen = {EMPTY}
+    frontier = [EMPTY]
+    for _ in range(max_turns):
+        new_frontier = []
+        for code in frontier:
+            for player, pure in (('X', PURE_X), ('O', PURE_O)):
+                if code != pure:
+                    nxt = half_pow(code, player)
+                    if nxt not in seen:
+                        seen.add(nxt)
+                        new_frontier.append(nxt)
+        frontier = new_frontier
+    seen.discard(EMPTY)  # la celda vacía no tiene etiqueta
+    return {atlas_key(*cell_probs(code)): cell_probs(code) for code in seen}
+
+
+def render_state(probs):
+    coef_x, coef_o = probs[0].sqrt(), probs[1].sqrt()
+    expression, colors = ket_expression(coef_x.latex() if coef_x != 0 else None,
+                                        coef_o.latex() if coef_o != 0 else None)
+    return render_latex(expression, colors, fontsize=20)
+
+
+def pack(glyphs, width):
+    # Empaquetado por estanterías: glifos ordenados por altura, filas de izquierda a derecha
+    rects = {}
+    x = y = shelf = 0
+    for key, img in sorted(glyphs.items(), key=lambda kv: -kv[1].get_height()):
+        w, h = img.get_size()
+        if x + w > width:
+            x, y, shelf = 0, y + shelf, 0
+        rects[key] = (x, y, w, h)
+        x += w
+        shelf = max(shelf, h)
+    return rects, y + shelf
+
+
+def main(max_turns=MAX_TURNS):
+    pygame.init()
+    states = reachable_states(max_turns)
+    glyphs = {key: render_state(probs) for key, probs in states.items()}
+    rects, height = pack(glyphs, ATLAS_WIDTH)
+
+    atlas = pygame.Surface((ATLAS_WIDTH, height), pygame.SRCALPHA)
+    for key, (x, y, w, h) in rects.items():
+        atlas.blit(glyphs[key], (x, y))
+    pygame.image.save(atlas, join(ASSETS, 'coef_atlas.png'))
+
+    with open(join(ASSETS, 'coef_atlas.json'), 'w') as f:
+        jsondump({'image': 'coef_atlas.png', 'max_turns': max_turns, 'glyphs': rects}, f, indent=1)
+    print(f"{len(rects)} glyphs packed into a {ATLAS_WIDTH}x{height} atlas")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main(int(argv[1]) if len(argv) > 1 else MAX_TURNS)
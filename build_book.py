@@ -0,0 +1,51 @@
+# Paso offline: recorre todas las posiciones de los primeros PLIES turnos con las reglas
+# estándar, pide a solver.py la jugada óptima de cada una (una por clase de simetría)
+# y las guarda en assets/opening_book.npz.
+#   python build_book.py [plies]
+from sys import argv
+from time import perf_counter
+
+import numpy as np
+
+from book import BOOK_PATH
+from dyadic import EMPTY
+from qengine import STANDARD_RULES
+from solver import Solver
+from transposition import start_hash, to_canonical
+
+PLIES = 8
+
+
+def main(plies):
+    solver = Solver(STANDARD_RULES)
+    start = perf_counter()
+    book = {}
+    frontier = [((EMPTY,) * 9, (), 'X', start_hash(False, STANDARD_RULES['max_turns']))]
+    for ply in range(plies):
+        next_frontier = []
+        for codes, log, player, position in frontier:
+            key, symmetry = position.canonical()
+            if key in book:
+                continue
+            other = 'O' if player == 'X' else 'X'
+            scored = []
+            for cell, new_codes, new_log, child in solver.children(codes, log, player, position):
+                scored.append((solver.search(new_codes, new_log, other, child), cell))
+                next_frontier.append((new_codes, new_log, other, child))
+            if not scored:
+                continue
+            value, cell = max(scored, key=lambda pair: (pair[0], -pair[1])) if player == 'X' else min(scored)
+            book[key] = (to_canonical(cell, symmetry), value)
+        frontier = next_frontier
+        print(f"ply {ply + 1}: {len(book)} positions", flush=True)
+
+    keys = np.array(sorted(book), dtype=np.uint64)
+    moves = np.array([book[key][0] for key in keys.tolist()], dtype=np.uint8)
+    values = np.array([book[key][1] for key in keys.tolist()], dtype=np.float32)
+    np.savez_compressed(BOOK_PATH, keys=keys, moves=moves, values=values)
+    print(f"{len(book)} positions -> {BOOK_PATH} in {perf_counter() - start:.1f} s")
+    print(solver.stats())
+
+
+if __name__ == "__main__":
+    main(int(argv[1]) if len(argv) > 1 else PLIES)
@@ -0,0 +1,177 @@
+# Aritmética exacta del modelo half_pow sin sympy.
+#
+# Con half_pow las probabilidades de una celda son siempre diádicas: la minoritaria
+# es 1/2**k y la mayoritaria (2**k - 1)/2**k. Cada celda se guarda como un entero:
+#   EMPTY          celda sin jugar            (0, 0)
+#   PURE_X/PURE_O  una sola jugada            (1, 0) / (0, 1)
+#   d              superposición, con k = |d| + 1 y X mayoritaria si d > 0
+# Jugar X suma 1 a d y jugar O resta 1, así que una jugada es una suma de enteros.
+from functools import lru_cache, total_ordering
+from math import gcd, isfinite, isqrt
+
+EMPTY = -32768
+PURE_O = -32767
+PURE_X = 32767
+MAX_LEVEL = 32766
+
+
+def half_pow(code, player):
+    # Nuevo código de la celda tras una jugada de `player` (debe ser legal: code != PURE_player)
+    if player == 'X':
+        if code == EMPTY:
+            return PURE_X
+        if code == PURE_O:
+            return 0
+        code += 1
+    else:
+        if code == EMPTY:
+            return PURE_O
+        if code == PURE_X:
+            return 0
+        code -= 1
+    if abs(code) > MAX_LEVEL:
+        raise OverflowError("cell probability below 2**-32767")
+    return code
+
+
+@total_ordering
+class Dyadic:
+    # Número racional num / 2**exp, siempre en su forma irreducible
+    __slots__ = ('num', 'exp')
+
+    def __init__(self, num, exp=0):
+        while exp > 0 and num % 2 == 0:
+            num //= 2
+            exp -= 1
+        self.num = num
+        self.exp = exp if num else 0
+
+    def __eq__(self, other):
+        if isinstance(other, Dyadic):
+            return self.num == other.num and self.exp == other.exp
+        if isinstance(other, int):
+            return self.num == other << self.exp
+        if isinstance(other, float):
+            # Exacto y sin pasar 2**exp a float, que se desborda con exp >= 1024
+            if not isfinite(other):
+                return False
+            num, den = other.as_integer_ratio()
+            return self.num * den == num << self.exp
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, Dyadic):
+            return self.num << other.exp < other.num << self.exp
+        if isinstance(other, int):
+            return self.num < other << self.exp
+        if isinstance(other, float):
+            if not isfinite(other):
+                return other > 0
+            num, den = other.as_integer_ratio()
+            return self.num * den < num << self.exp
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.num) if self.exp == 0 else hash((self.num, self.exp))
+
+    def __float__(self):
+        return self.num / (1 << self.exp)
+
+    def __str__(self):
+        # Igual que str(sympy.Rational)
+        return str(self.num) if self.exp == 0 else f"{self.num}/{1 << self.exp}"
+
+    __repr__ = __str__
+
+    def sqrt(self):
+        return DyadicSqrt(self)
+
+
+ZERO = Dyadic(0)
+ONE = Dyadic(1)
+
+
+@lru_cache(maxsize=None)
+def split_square(n):
+    # n = a**2 * b con b libre de cuadrados. Basta probar divisores hasta n**(1/3):
+    # lo que queda tiene como mucho dos factores primos y solo es cuadrado si es q**2
+    a, b, p = 1, 1, 2
+    while p * p * p <= n:
+        while n % (p * p) == 0:
+            n //= p * p
+            a *= p
+        if n % p == 0:
+            n //= p
+            b *= p
+        p += 1 if p == 2 else 2
+    root = isqrt(n)
+    if root * root == n:
+        return a * root, b
+    return a, b * n
+
+
+@lru_cache(maxsize=4096)
+def sqrt_parts(num, exp):
+    # sqrt(num / 2**exp) = a * sqrt(b) / c, como lo simplifica sympy
+    if exp % 2:
+        num, exp = num * 2, exp + 1
+    a, b = split_square(num)
+    c = 1 << (exp // 2)
+    g = gcd(a, c)
+    return a // g, b, c // g
+
+
+class DyadicSqrt:
+    # Coeficiente de un ket, sqrt(p); solo se simplifica cuando hace falta mostrarlo
+    __slots__ = ('prob',)
+
+    def __init__(self, prob):
+        self.prob = prob
+
+    def __eq__(self, other):
+        if isinstance(other, DyadicSqrt):
+            return self.prob == other.prob
+        if other == 0 or other == 1:
+            return self.prob == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(('sqrt', self.prob))
+
+    def parts(self):
+        # (a, b, c) tales que el coeficiente es a * sqrt(b) / c
+        return sqrt_parts(self.prob.num, self.prob.exp)
+
+    def __str__(self):
+        # Igual que str(sympy.sqrt(p))
+        a, b, c = self.parts()
+        if b == 1:
+            top = str(a)
+        else:
+            top = f"sqrt({b})" if a == 1 else f"{a}*sqrt({b})"
+        return top if c == 1 else f"{top}/{c}"
+
+    __repr__ = __str__
+
+    def latex(self):
+        # Igual que sympy.latex(sympy.sqrt(p))
+        a, b, c = self.parts()
+        if b == 1:
+            top = str(a)
+        else:
+            top = f"\\sqrt{{{b}}}" if a == 1 else f"{a} \\sqrt{{{b}}}"
+        return top if c == 1 else f"\\frac{{{top}}}{{{c}}}"
+
+
+@lru_cache(maxsize=None)
+def cell_probs(code):
+    # (prob X, prob O) exactas de una celda
+    if code == EMPTY:
+        return ZERO, ZERO
+    if code == PURE_X:
+        return ONE, ZERO
+    if code == PURE_O:
+        return ZERO, ONE
+    k = abs(code) + 1
+    major, minor = Dyadic((1 << k) - 1, k), Dyadic(1, k)
+    return (major, minor) if code >= 0 else (minor, major)
@@ -0,0 +1,266 @@
+from collections import OrderedDict
+from json import load as jsonload
+from os import remove
+from os.path import dirname, join
+from tempfile import NamedTemporaryFile
+
+import pygame
+
+# matplotlib se importa solo dentro de las funciones de render: con el atlas
+# precalculado (build_atlas.py) no hace falta cargarlo durante la partida
+
+
+def surface_bytes(surface):
+    # Memoria ocupada por los pixeles de una Surface
+    return surface.get_pitch() * surface.get_height()
+
+
+class GlyphCache:
+    # LRU de Surfaces listas para blit, acotada por memoria
+    def __init__(self, max_bytes=4 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def get(self, key, render):
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = render()
+        self._surfaces[key] = surface
+        self.bytes += surface_bytes(surface)
+        # Evict least recently used glyphs until we fit again (always keep the newest one)
+        while self.bytes > self.max_bytes and len(self._surfaces) > 1:
+            _, old = self._surfaces.popitem(last=False)
+            self.bytes -= surface_bytes(old)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def __str__(self):
+        return f"{type(self).__name__}: {len(self)} glyphs, {self.bytes} bytes, {self.hits} hits, {self.misses} misses"
+
+
+class TextCache(GlyphCache):
+    # Textos ya rasterizados con font.render, indexados por (texto, fuente, color, antialias).
+    # Las etiquetas fijas se rasterizan una vez por sesión; las que cambian rotan por la LRU.
+    def render(self, font, text, antialias, color):
+        return self.get((text, font, color, antialias), lambda: font.render(text, antialias, color))
+
+
+text_cache = TextCache(max_bytes=2 * 1024 * 1024)
+
+
+class _BufferSink:
+    # "Archivo" que se queda con la vista RGBA que escribe el canvas Agg, sin copiarla
+    def __init__(self):
+        self.data = None
+
+    def seek(self, *args):
+        return 0
+
+    def write(self, data):
+        self.data = data
+
+
+_latex_figures = {}  # dpi -> Figure reutilizada por el camino 'buffer'
+
+
+def render_latex_figure(expression, colors, fontsize=15, dpi=100, reuse=False):
+    # reuse: la misma figura, canvas y ejes para todos los glifos, en vez de crearlos
+    # cada vez (el resto del coste es el análisis de mathtext dentro de savefig)
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    if reuse and dpi in _latex_figures:
+        fig = _latex_figures[dpi]
+        ax = fig.axes[0]
+        for text in list(ax.texts):
+            text.remove()
+    else:
+        fig = Figure(figsize=(1, 1), dpi=dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        if reuse:
+            _latex_figures[dpi] = fig
+    xpos=0
+    for ket,col in zip(expression,colors):
+        text_obj=ax.text(xpos, 0, f"${ket}$",color=col, fontsize=fontsize, ha='left', va='center')
+        bbox = text_obj.get_window_extent()  # Obtiene el bbox en puntos de pantalla
+        text_width = bbox.width / dpi  # Convierte a pulgadas
+        xpos += (text_width+0.2)
+    ax.axis('off')  # Oculta los ejes
+    return fig
+
+
+def figure_to_png_surface(fig):
+    # Camino antiguo: PNG temporal en disco que se vuelve a cargar
+    with NamedTemporaryFile(suffix=".png", delete=False) as tmpfile:
+        fig.savefig(tmpfile.name, bbox_inches='tight', pad_inches=0, transparent=True)
+    img = pygame.image.load(tmpfile.name)
+    remove(tmpfile.name)
+    return img
+
+
+def figure_to_surface(fig):
+    # El canvas Agg se rasteriza directamente en memoria (sin archivos ni PNG)
+    sink = _BufferSink()
+    fig.savefig(sink, format='rgba', bbox_inches='tight', pad_inches=0, transparent=True)
+    height, width, _ = sink.data.shape
+    return pygame.image.frombuffer(sink.data, (width, height), 'RGBA')
+
+
+def ket_expression(latex_x, latex_o):
+    # Expresión con los kets de coeficiente no nulo (None = coeficiente nulo)
+    expression = []
+    colors=[]
+
+    if latex_x is not None:
+        expression.append(f"{latex_x}|X\\rangle")
+        colors.append('red')
+    if latex_o is not None:
+        expression.append(f"{latex_o}|O\\rangle")
+        colors.append('blue')
+    if latex_x is not None and latex_o is not None:
+        expression.insert(1,' + ')
+        colors.insert(1,'black')
+    return expression, colors
+
+
+def render_latex(expression, colors, fontsize=15, dpi=100, raster='buffer'):
+    # 'png' es el camino anterior (figura nueva y PNG temporal), para comparar en bench_raster
+    fig = render_latex_figure(expression, colors, fontsize=fontsize, dpi=dpi, reuse=raster == 'buffer')
+    img = figure_to_surface(fig) if raster == 'buffer' else figure_to_png_surface(fig)
+    # Una sola conversión al formato de pixel de la pantalla (si ya hay una)
+    if pygame.display.get_surface() is not None:
+        img = img.convert_alpha()
+    else:
+        img = img.copy()
+    return img
+
+
+def atlas_key(prob_x, prob_o):
+    # Clave del atlas: probabilidades exactas, p.ej. "3/4,1/4"
+    return f"{prob_x},{prob_o}"
+
+
+class GlyphAtlas:
+    # Todas las etiquetas precalculadas en una sola imagen; cada glifo es una subsurface
+    def __init__(self, image, rects):
+        self.image = image
+        self.glyphs = {key: image.subsurface(rect) for key, rect in rects.items()}
+
+    @classmethod
+    def load(cls, index_path):
+        with open(index_path) as f:
+            index = jsonload(f)
+        image = pygame.image.load(join(dirname(index_path), index['image']))
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        return cls(image, index['glyphs'])
+
+    def get(self, key):
+        return self.glyphs.get(key)
+
+    def __len__(self):
+        return len(self.glyphs)
+
+
+# Render nativo de coeficientes (sin matplotlib) para la gramática que produce State:
+# a*sqrt(b)/c delante de cada ket, con "+" entre los dos términos.
+NATIVE_HEIGHT = 98  # Mismo alto y línea central que los glifos de mathtext
+NATIVE_CENTER = 76
+NATIVE_COLORS = {'X': (255, 0, 0), 'O': (0, 0, 255), '+': (0, 0, 0)}
+_native_fonts = {}
+
+
+def _native_font(size, italic=False):
+    font = _native_fonts.get((size, italic))
+    if font is None:
+        font = pygame.font.SysFont("dejavusans,freesans,arial", size, italic=italic)
+        _native_fonts[(size, italic)] = font
+    return font
+
+
+def _radical(number, color, size):
+    # a*sqrt(b) (o solo a) como Surface
+    a, b = number
+    font = _native_font(size)
+    lead = text_cache.render(font, str(a), True, color) if a != 1 or b == 1 else None
+    if b == 1:
+        return lead
+    radicand = text_cache.render(font, str(b), True, color)
+    w, h = radicand.get_size()
+    stroke = max(1, size // 14)
+    sign = h // 2
+    x0 = lead.get_width() + 1 if lead else 0
+    surface = pygame.Surface((x0 + sign + w + 2, h + 2), pygame.SRCALPHA)
+    if lead:
+        surface.blit(lead, (0, (surface.get_height() - lead.get_height()) // 2))
+    points = [(x0, h * 3 // 5), (x0 + sign // 4, h // 2), (x0 + sign // 2, h), (x0 + sign, 1), (x0 + sign + w + 1, 1)]
+    pygame.draw.lines(surface, color, False, points, stroke)
+    surface.blit(radicand, (x0 + sign + 1, 2))
+    return surface
+
+
+def _coefficient(parts, color, size):
+    # a*sqrt(b)/c: fracción con numerador y denominador a tamaño reducido
+    a, b, c = parts
+    if c == 1:
+        return _radical((a, b), color, size)
+    small = size * 7 // 10
+    top = _radical((a, b), color, small)
+    bottom = text_cache.render(_native_font(small), str(c), True, color)
+    w = max(top.get_width(), bottom.get_width()) + 2
+    stroke = max(1, size // 20)
+    surface = pygame.Surface((w, top.get_height() + bottom.get_height() + stroke + 2), pygame.SRCALPHA)
+    surface.blit(top, ((w - top.get_width()) // 2, 0))
+    bar = top.get_height() + 1
+    pygame.draw.line(surface, color, (0, bar), (w - 1, bar), stroke)
+    surface.blit(bottom, ((w - bottom.get_width()) // 2, bar + stroke + 1))
+    return surface
+
+
+def _ket(label, color, size):
+    # |X> con la barra y el ángulo dibujados con líneas
+    letter = text_cache.render(_native_font(size, italic=True), label, True, color)
+    w, h = letter.get_size()
+    stroke = max(1, size // 14)
+    angle = h // 4
+    surface = pygame.Surface((w + angle + 8, h), pygame.SRCALPHA)
+    pygame.draw.line(surface, color, (2, 1), (2, h - 2), stroke)
+    surface.blit(letter, (4, 0))
+    x = 4 + w + 1
+    pygame.draw.lines(surface, color, False, [(x, 1), (x + angle, h // 2), (x, h - 2)], stroke)
+    return surface
+
+
+def render_native(terms, size=44):
+    # terms: [((a, b, c), 'X'), ...] para cada ket con coeficiente no nulo
+    pieces = []
+    for n, (parts, label) in enumerate(terms):
+        color = NATIVE_COLORS[label]
+        if n:
+            pieces.append((text_cache.render(_native_font(size), ' + ', True, NATIVE_COLORS['+']), 0))
+        pieces.append((_coefficient(parts, color, size), 1))
+        pieces.append((_ket(label, color, size), 3))
+    width = sum(piece.get_width() + gap for piece, gap in pieces) + 4
+    surface = pygame.Surface((width, NATIVE_HEIGHT), pygame.SRCALPHA)
+    x = 2
+    for piece, gap in pieces:
+        surface.blit(piece, (x, NATIVE_CENTER - piece.get_height() // 2))
+        x += piece.get_width() + gap
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    return surface
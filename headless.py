@@ -0,0 +1,104 @@
+# Modo sin pantalla: dibuja tableros en una Surface offscreen (driver SDL "dummy")
+# y devuelve cada frame como bytes RGB crudos o PNG.
+#   python headless.py [frames] [--png] [--native]
+from io import BytesIO
+from os import environ
+from random import Random
+from sys import argv
+from time import perf_counter
+from types import SimpleNamespace
+
+import pygame
+from numpy import empty
+
+from board_view import BoardView, WIDTH, HEIGHT
+from dyadic import Dyadic
+
+
+def board_cells(rows):
+    # rows: 3x3 con 'X'/'O' (celda colapsada) o (prob X, prob O) como Dyadic o enteros;
+    # devuelve lo que espera draw_state
+    grid = empty((3, 3), dtype=object)
+    for i, row in enumerate(rows):
+        for j, cell in enumerate(row):
+            if cell in ('X', 'O'):
+                probs = {'X': Dyadic(0), 'O': Dyadic(0)}
+            else:
+                probs = {player: p if isinstance(p, Dyadic) else Dyadic(p) for player, p in zip('XO', cell)}
+            coefs = {player: p.sqrt() for player, p in probs.items()}
+            grid[i, j] = SimpleNamespace(i=i, j=j, collapsed=cell if cell in ('X', 'O') else None, probs=probs, coefs=coefs)
+    return grid
+
+
+class HeadlessRenderer:
+    def __init__(self, glyphs='mathtext'):
+        environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.font.init()
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((1, 1))  # Solo para fijar el formato de pixel (convert_alpha)
+        self.surface = pygame.Surface((WIDTH, HEIGHT))
+        self.view = BoardView(self.surface, glyphs=glyphs)
+        self.frames = 0
+        self.seconds = 0.0
+
+    def draw(self, grid, player=None, progress=None, winner=None):
+        self.view.draw_grid()
+        self.view.draw_state(grid)
+        if winner is not None:
+            self.view.draw_winner(winner)
+        elif player is not None:
+            self.view.draw_turn(player, progress)
+
+    def frame(self, grid, player=None, progress=None, winner=None, fmt='raw'):
+        # fmt='raw': bytes RGB de WIDTH x HEIGHT; fmt='png': archivo PNG completo
+        start = perf_counter()
+        self.draw(grid, player, progress, winner)
+        if fmt == 'png':
+            out = BytesIO()
+            pygame.image.save(self.surface, out, 'frame.png')
+            data = out.getvalue()
+        else:
+            data = pygame.image.tobytes(self.surface, 'RGB')
+        self.seconds += perf_counter() - start
+        self.frames += 1
+        return data
+
+    @property
+    def fps(self):
+        return self.frames / self.seconds if self.seconds else 0.0
+
+
+def random_board(rng):
+    rows = []
+    for i in range(3):
+        row = []
+        for j in range(3):
+            kind = rng.randrange(5)
+            if kind == 0:
+                row.append((0, 0))
+            elif kind == 1:
+                row.append(rng.choice([(1, 0), (0, 1)]))
+            elif kind == 2:
+                row.append(rng.choice('XO'))
+            else:
+                k = rng.randrange(1, 8)
+                minority, majority = Dyadic(1, k), Dyadic(2**k - 1, k)
+                row.append(rng.choice([(majority, minority), (minority, majority)]))
+        rows.append(row)
+    return board_cells(rows)
+
+
+def main(frames=500, fmt='raw', glyphs='mathtext'):
+    rng = Random(0)
+    boards = [random_board(rng) for _ in range(50)]
+    renderer = HeadlessRenderer(glyphs)
+    size = 0
+    for n in range(frames):
+        size += len(renderer.frame(boards[n % len(boards)], player='XO'[n % 2], progress=(n % 14 + 1, 14), fmt=fmt))
+    print(f"{renderer.frames} {fmt} frames in {renderer.seconds:.2f}s: {renderer.fps:.1f} fps, {size / renderer.frames / 1024:.1f} KiB/frame")
+
+
+if __name__ == "__main__":
+    args = [a for a in argv[1:] if not a.startswith('--')]
+    main(int(args[0]) if args else 500, 'png' if '--png' in argv else 'raw', 'native' if '--native' in argv else 'mathtext')
@@ -0,0 +1,143 @@
+# Jugador Monte Carlo Tree Search con un presupuesto de tiempo por jugada.
+#
+# Cada proceso del pool hace su propia búsqueda desde la posición actual (paralelismo
+# de raíz) y al acabar el tiempo se suman las visitas de cada jugada. Dentro de un
+# proceso las hojas se eligen de PLAYOUTS en PLAYOUTS con UCT; esas partidas se terminan
+# a la vez con BatchGames y sus tableros finales se puntúan de forma exacta con
+# outcome_probs (P(X won!) - P(O won!)), sin muestrear el colapso.
+from concurrent.futures import ProcessPoolExecutor
+from math import log as ln, sqrt
+from os import cpu_count
+from time import perf_counter
+
+import numpy as np
+
+from batch import BatchGames
+from book import book_move
+from dyadic import EMPTY
+from models import rules_model
+from odds import outcome_probs
+from qengine import HARDCORE, legal_cells
+
+PLAYOUTS = 32      # hojas por lote de simulaciones
+EXPLORATION = 1.0  # constante de UCT (los valores van de -1 a 1)
+
+
+class Node:
+    __slots__ = ('codes', 'log', 'player', 'children', 'untried', 'visits', 'total')
+
+    def __init__(self, codes, log, player, rules):
+        self.codes = codes
+        self.log = log
+        self.player = player
+        self.children = {}
+        self.untried = [] if finished(codes, log, rules) else legal_cells(codes, log, player, rules['last_moves'])
+        self.visits = 0
+        self.total = 0.0  # suma de valores desde el punto de vista de X
+
+    def expand(self, cell, rules):
+        codes = list(self.codes)
+        codes[cell] = rules_model(rules).next[self.player][codes[cell]]
+        child = Node(tuple(codes), self.log + (cell,), 'O' if self.player == 'X' else 'X', rules)
+        self.children[cell] = child
+        return child
+
+    def select(self):
+        # UCT desde el punto de vista de quien mueve en este nodo
+        sign = 1 if self.player == 'X' else -1
+        spread = EXPLORATION * sqrt(ln(self.visits))
+        return max(self.children.values(),
+                   key=lambda child: sign * child.total / child.visits + spread / sqrt(child.visits))
+
+
+def finished(codes, log, rules):
+    if rules.get('hardcore', False) or rules['max_turns'] == HARDCORE:
+        return EMPTY not in codes
+    return len(log) >= rules['max_turns']
+
+
+def search(rules, codes, log, player, budget, seed):
+    # Búsqueda de un proceso: {celda: (visitas, suma de valores)} y simulaciones hechas
+    root = Node(codes, log, player, rules)
+    rng = np.random.default_rng(seed)
+    deadline = perf_counter() + budget
+    playouts = 0
+    while True:
+        paths = []
+        for _ in range(PLAYOUTS):
+            node, path = root, [root]
+            while not node.untried and node.children:
+                node = node.select()
+                path.append(node)
+            if node.untried:
+                cell = node.untried.pop(rng.integers(len(node.untried)))
+                node = node.expand(cell, rules)
+                path.append(node)
+            for visited in path:
+                visited.visits += 1  # pérdida virtual: el resto del lote explora otras ramas
+            paths.append(path)
+
+        batch = BatchGames.from_positions([(path[-1].codes, path[-1].log, path[-1].player) for path in paths], rules)
+        batch.play_random(rng)
+        probs = outcome_probs(batch.cells, batch.model)
+        for path, value in zip(paths, (probs[:, 1] - probs[:, 2]).tolist()):
+            for visited in path:
+                visited.total += value
+        playouts += len(paths)
+        if perf_counter() >= deadline:
+            break  # al menos un lote, aunque el plazo sea 0
+    return {cell: (child.visits, child.total) for cell, child in root.children.items()}, playouts
+
+
+class MCTSPlayer:
+    # choose(game) -> (fila, columna). workers=1 busca en el propio proceso
+    def __init__(self, rules, budget=1.0, workers=None, seed=None):
+        self.rules = rules
+        self.budget = budget
+        self.workers = workers or cpu_count()
+        self.seeds = np.random.SeedSequence(seed)
+        self.pool = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        self.playouts = 0
+        self.elapsed = 0.0
+        self.book_moves = 0
+
+    def choose(self, game):
+        if game.over():
+            raise ValueError("game is over")
+        move = book_move(game)
+        if move is not None:
+            self.book_moves += 1
+            return move
+        codes = tuple(state.code for state in game.grid.flat)
+        log = tuple(3*row + col for row, col in game.moves_log)
+        args = (self.rules, codes, log, game.turn.player, self.budget)
+        seeds = self.seeds.spawn(self.workers)
+        start = perf_counter()
+        if self.pool is None:
+            results = [search(*args, seeds[0])]
+        else:
+            results = list(self.pool.map(search, *zip(*[args + (seed,) for seed in seeds])))
+        self.elapsed += perf_counter() - start
+
+        visits = {}
+        for stats, playouts in results:
+            self.playouts += playouts
+            for cell, (count, _) in stats.items():
+                visits[cell] = visits.get(cell, 0) + count
+        if not visits:
+            # Sin simulaciones terminadas: cualquier jugada legal antes que ninguna
+            moves = legal_cells(codes, log, game.turn.player, self.rules['last_moves'])
+            return divmod(moves[0], 3)
+        cell = max(sorted(visits), key=visits.get)
+        return divmod(cell, 3)
+
+    def rate(self):
+        return self.playouts / self.elapsed if self.elapsed else 0.0
+
+    def stats(self):
+        return (f"{self.playouts} playouts in {self.elapsed:.1f} s, {self.rate():,.0f} playouts/s "
+                f"({self.workers} workers), {self.book_moves} book moves")
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
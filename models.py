@@ -0,0 +1,140 @@
+# Modelos de peso: cómo cambia una celda cuando un jugador la elige (el w_model de
+# State.move). Cada modelo se compila al registrarlo en tablas de transición sobre los
+# 65536 códigos int16: next[jugador][código] es el código tras la jugada, así que los
+# motores solo indexan. Las tablas van en el orden de int16 en complemento a dos
+# (0..32767 y luego -32768..-1), de modo que un código negativo indexa desde el final.
+#
+# Todo modelo usa EMPTY, PURE_X y PURE_O (dyadic.py) para la celda vacía y las celdas con
+# una sola pieza, que es lo que la legalidad y el colapso miran. Las jugadas ilegales o los
+# códigos que el modelo no usa dejan la celda igual.
+from fractions import Fraction
+from functools import lru_cache
+from math import gcd
+from types import MappingProxyType
+
+import numpy as np
+
+from dyadic import EMPTY, PURE_X, PURE_O, MAX_LEVEL, DyadicSqrt, cell_probs, split_square
+
+CODES = np.arange(1 << 16, dtype=np.uint16).view(np.int16)
+MODELS = {}
+
+
+class WeightModel:
+    # step(codes, player): versión vectorizada de la jugada sobre un array de códigos
+    # prob_x(codes): P(X) de cada código como float (para odds.py y BatchGames)
+    # cell_probs(code): (P(X), P(O)) exactas de un código, lo que se muestra
+    def __init__(self, name, step, prob_x, cell_probs):
+        self.name = name
+        self.table = {player: step(CODES.astype(np.int64), player).astype(np.int16) for player in 'XO'}
+        self.next = {player: tuple(table.tolist()) for player, table in self.table.items()}
+        self.px = prob_x(CODES.astype(np.int64))
+        self.cell_probs = lru_cache(maxsize=None)(cell_probs)
+
+    @lru_cache(maxsize=None)
+    def probs(self, code):
+        # {'X': px, 'O': po} de un código, compartido (y de solo lectura) entre celdas iguales
+        px, po = self.cell_probs(code)
+        return MappingProxyType({'X': px, 'O': po})
+
+    def __repr__(self):
+        return f"WeightModel({self.name!r})"
+
+
+def register(name, step, prob_x, cell_probs):
+    MODELS[name] = WeightModel(name, step, prob_x, cell_probs)
+    return MODELS[name]
+
+
+def get_model(name):
+    try:
+        return MODELS[name]
+    except KeyError:
+        raise ValueError(f"unknown weight model {name!r} (available: {', '.join(MODELS)})") from None
+
+
+def rules_model(rules):
+    # El modelo de un diccionario de reglas (clave opcional w_model, half_pow por defecto)
+    return get_model(rules.get('w_model', 'half_pow'))
+
+
+def half_pow_step(codes, player):
+    # dyadic.half_pow sobre arrays; en ±MAX_LEVEL la celda se queda igual en vez de desbordar
+    if player == 'X':
+        new = np.where(codes >= MAX_LEVEL, codes, codes + 1)
+        new = np.where(codes == PURE_O, 0, new)
+        return np.where(codes == EMPTY, PURE_X, new)
+    new = np.where(codes <= -MAX_LEVEL, codes, codes - 1)
+    new = np.where(codes == PURE_X, 0, new)
+    return np.where(codes == EMPTY, PURE_O, new)
+
+
+def half_pow_prob_x(codes):
+    # Exacta: 1/2**k o 1 - 1/2**k
+    minority = np.ldexp(1.0, -np.minimum(np.abs(codes) + 1, 1100))
+    prob = np.where(codes >= 0, 1.0 - minority, minority)
+    prob = np.where(codes == PURE_X, 1.0, prob)
+    return np.where((codes == PURE_O) | (codes == EMPTY), 0.0, prob)
+
+
+HALF_POW = register('half_pow', half_pow_step, half_pow_prob_x, cell_probs)
+
+
+# Modelo counter (V1 de TestQGame.ipynb): cada celda cuenta las jugadas de cada jugador y
+# los coeficientes son x/sqrt(x² + o²) y o/sqrt(x² + o²). Con x y o >= 1 el código es
+# x << 7 | o; (1, 0) y (0, 1) son PURE_X y PURE_O. Los contadores se saturan en 127.
+COUNT_BITS = 7
+MAX_COUNT = (1 << COUNT_BITS) - 1
+
+
+def counter_step(codes, player):
+    x, o = codes >> COUNT_BITS, codes & MAX_COUNT
+    mixed = (x >= 1) & (x <= MAX_COUNT) & (o >= 1)
+    if player == 'X':
+        new = np.where(mixed, np.minimum(x + 1, MAX_COUNT) << COUNT_BITS | o, codes)
+        new = np.where(codes == PURE_O, 1 << COUNT_BITS | 1, new)
+        return np.where(codes == EMPTY, PURE_X, new)
+    new = np.where(mixed, x << COUNT_BITS | np.minimum(o + 1, MAX_COUNT), codes)
+    new = np.where(codes == PURE_X, 1 << COUNT_BITS | 1, new)
+    return np.where(codes == EMPTY, PURE_O, new)
+
+
+def counter_prob_x(codes):
+    x, o = (codes >> COUNT_BITS).astype(float), (codes & MAX_COUNT).astype(float)
+    mixed = (x >= 1) & (x <= MAX_COUNT) & (o >= 1)
+    prob = np.where(mixed, x * x / np.maximum(x * x + o * o, 1.0), 0.0)
+    return np.where(codes == PURE_X, 1.0, prob)
+
+
+class Ratio(Fraction):
+    # Probabilidad racional cualquiera, con el coeficiente sqrt(p) que usa State.coefs
+    def sqrt(self):
+        return RatioSqrt(self)
+
+
+class RatioSqrt(DyadicSqrt):
+    __slots__ = ()
+
+    def parts(self):
+        # sqrt(n/d) = sqrt(n*d)/d = a*sqrt(b)/d, como lo simplifica sympy
+        num, den = self.prob.numerator, self.prob.denominator
+        if num == 0:
+            return 0, 1, 1
+        a, b = split_square(num * den)
+        g = gcd(a, den)
+        return a // g, b, den // g
+
+
+def counter_cell_probs(code):
+    if code == EMPTY:
+        return Ratio(0), Ratio(0)
+    if code == PURE_X:
+        return Ratio(1), Ratio(0)
+    if code == PURE_O:
+        return Ratio(0), Ratio(1)
+    x, o = code >> COUNT_BITS, code & MAX_COUNT
+    norm = x * x + o * o
+    return Ratio(x * x, norm), Ratio(o * o, norm)
+
+
+COUNTER = register('counter', counter_step, counter_prob_x, counter_cell_probs)
@@ -0,0 +1,84 @@
+# Probabilidades exactas del resultado de un tablero cuántico, sin muestrear el colapso.
+# Cada celda jugada colapsa a X con probabilidad p_X de forma independiente, así que
+# basta con recorrer las 512 máscaras de X: P(máscara) es un producto de 9 factores
+# y su resultado sale de la tabla de bitboard.py. Todo va vectorizado sobre
+# (tableros, 512 máscaras).
+from functools import lru_cache
+
+import numpy as np
+
+from bitboard import OUTCOME_TABLE, RESULTS, TERNARY
+from dyadic import EMPTY, PURE_X, PURE_O
+from models import HALF_POW
+
+MASKS = np.arange(512)
+BITS = (MASKS[:, None] >> np.arange(9) & 1).astype(bool)                # (512, 9)
+LOW_BITS = (np.arange(32)[:, None] >> np.arange(5) & 1).astype(bool)   # celdas 0-4
+HIGH_BITS = (np.arange(16)[:, None] >> np.arange(4) & 1).astype(bool)  # celdas 5-8
+TERNARY_MASKS = np.array(TERNARY)
+OUTCOMES = np.frombuffer(OUTCOME_TABLE, dtype=np.int8)
+CELL_BITS = 1 << np.arange(9)
+CHUNK = 4096
+
+
+def prob_x(codes, model=HALF_POW):
+    # Probabilidad de X de cada celda como float, de la tabla del modelo (models.py). Vacías: 0
+    return model.px[np.asarray(codes)]
+
+
+@lru_cache(maxsize=512)
+def result_matrix(played):
+    # (512, 3) one-hot del resultado de cada máscara de X con las celdas `played` jugadas;
+    # las máscaras imposibles (X en una celda vacía) tienen peso 0 y da igual su fila
+    results = OUTCOMES[TERNARY_MASKS + 2 * TERNARY_MASKS[played & ~MASKS]]
+    return np.eye(3)[results]
+
+
+def mask_weights(px, po):
+    # (N, 512) P(máscara de X) = producto de 9 factores, como producto externo de 16 x 32
+    low = np.ones((len(px), 32))
+    for cell in range(5):
+        low *= np.where(LOW_BITS[:, cell], px[:, cell, None], po[:, cell, None])
+    high = np.ones((len(px), 16))
+    for n, cell in enumerate(range(5, 9)):
+        high *= np.where(HIGH_BITS[:, n], px[:, cell, None], po[:, cell, None])
+    return (high[:, :, None] * low[:, None, :]).reshape(len(px), 512)
+
+
+def outcome_probs(codes, model=HALF_POW):
+    # codes: (9,) o (N, 9) códigos de celda. Devuelve (N, 3): P(Tie), P(X won!), P(O won!)
+    codes = np.atleast_2d(codes)
+    probs = np.empty((len(codes), 3))
+    for first in range(0, len(codes), CHUNK):
+        chunk = codes[first:first + CHUNK]
+        px = prob_x(chunk, model)
+        played = chunk != EMPTY
+        po = np.where(played, 1.0 - px, 1.0)  # las celdas vacías nunca son X ni O
+        weights = mask_weights(px, po)
+        # Los tableros con las mismas celdas jugadas comparten la tabla de resultados
+        played = played @ CELL_BITS
+        groups, inverse = np.unique(played, return_inverse=True)
+        out = probs[first:first + CHUNK]
+        for group, mask in enumerate(groups.tolist()):
+            rows = inverse == group
+            out[rows] = weights[rows] @ result_matrix(mask)
+    return probs
+
+
+def board_probs(codes, model=HALF_POW):
+    # Un solo tablero (9 códigos): evita la maquinaria por lotes de outcome_probs
+    px = [float(model.px[code]) for code in codes]
+    po = [1.0 - p if code != EMPTY else 1.0 for p, code in zip(px, codes)]
+    played = sum(1 << cell for cell, code in enumerate(codes) if code != EMPTY)
+    return np.where(BITS, px, po).prod(axis=1) @ result_matrix(played)
+
+
+def board_codes(grid):
+    # Códigos de una cuadrícula de State; las celdas ya colapsadas quedan fijas
+    pinned = {'X': PURE_X, 'O': PURE_O, '-': EMPTY}
+    return [pinned[state.collapsed] if state.collapsed is not None else state.code for state in grid.flat]
+
+
+def odds(grid, model=HALF_POW):
+    # {'Tie': p, 'X won!': p, 'O won!': p} de una cuadrícula de State
+    return dict(zip(RESULTS, board_probs(board_codes(grid), model).tolist()))
@@ -0,0 +1,61 @@
+# Políticas de jugada para BatchGames: policy(batch, rng) -> (N,) celda de cada partida
+# (-1 si la partida terminó). Para añadir una, basta con registrarla en POLICIES.
+import numpy as np
+
+from batch import X, next_codes
+from bitboard import LINE_CELLS
+from dyadic import EMPTY
+from odds import prob_x
+
+LINE_INDEX = np.array(LINE_CELLS)  # (8, 3)
+
+
+def random_policy(batch, rng):
+    return batch.random_moves(rng)
+
+
+def expected_lead(px, po):
+    # (N,) líneas esperadas de X menos líneas esperadas de O
+    return px[:, LINE_INDEX].prod(axis=2).sum(axis=1) - po[:, LINE_INDEX].prod(axis=2).sum(axis=1)
+
+
+def greedy_policy(batch, rng):
+    # La jugada que más mejora la ventaja esperada en líneas de quien mueve (empates al azar)
+    legal = batch.legal()
+    x_moves = batch.player == X
+    px = batch.prob_x()
+    po = np.where(batch.cells != EMPTY, 1.0 - px, 0.0)
+    scores = np.empty((batch.n, 9))
+    for cell in range(9):
+        after = prob_x(next_codes(batch.cells[:, cell], x_moves, batch.model), batch.model)
+        cell_px, cell_po = px.copy(), po.copy()
+        cell_px[:, cell] = after
+        cell_po[:, cell] = 1.0 - after
+        scores[:, cell] = expected_lead(cell_px, cell_po)
+    scores = np.where(x_moves[:, None], scores, -scores)
+    scores = np.where(legal, scores, -np.inf)
+    best = legal & (scores >= scores.max(axis=1, keepdims=True) - 1e-12)
+    cells = np.where(best, rng.random((batch.n, 9)), -1.0).argmax(axis=1)
+    return np.where(legal.any(axis=1), cells, -1)
+
+
+POLICIES = {
+    'random': random_policy,
+    'greedy': greedy_policy,
+}
+
+
+def play(batch, rng, x_policy='random', o_policy='random', max_plies=None):
+    # Juega todas las partidas del lote hasta el final, o hasta max_plies jugadas: en Hardcore
+    # dos políticas pueden repetir celdas ocupadas sin llegar nunca a llenar la cuadrícula
+    x_policy, o_policy = POLICIES[x_policy], POLICIES[o_policy]
+    while True:
+        if x_policy is o_policy:
+            cells = x_policy(batch, rng)
+        else:
+            cells = np.where(batch.player == X, x_policy(batch, rng), o_policy(batch, rng))
+        if max_plies is not None:
+            cells = np.where(batch.ply >= max_plies, -1, cells)
+        if (cells < 0).all():
+            return
+        batch.move(cells)
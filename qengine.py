@@ -0,0 +1,304 @@
+# Motor del juego sin pygame ni matplotlib: reglas, jugadas, colapso y resultado.
+# La interfaz (qgame_0.4.1.py) es solo un cliente de este módulo.
+
+from numpy import array
+from numpy.random import SeedSequence, default_rng
+
+from bitboard import masks, winner_lookup
+from dyadic import EMPTY, PURE_X, PURE_O
+from models import HALF_POW, get_model, rules_model
+from tracker import LineTracker
+from transposition import start_hash
+
+HARDCORE = -137  # max_turns que indica el modo Hardcore: la partida acaba con la cuadrícula llena
+
+STANDARD_RULES = {'xstart': True, 'max_turns': 14, 'last_moves': 1}
+HARDCORE_RULES = {'xstart': True, 'max_turns': HARDCORE, 'last_moves': 1}
+
+PINNED = {'X': PURE_X, 'O': PURE_O, '-': EMPTY}  # código equivalente de una celda colapsada
+
+
+def legal_cells(codes, log, player, last_moves):
+    # Jugadas legales de una posición en tuplas (códigos, celdas jugadas, jugador), como
+    # Game.is_legal: sin la pieza pura del jugador y fuera de moves_log[len-last_moves:]
+    pure = PURE_X if player == 'X' else PURE_O
+    frozen = log[len(log)-last_moves:] if last_moves else ()
+    return [cell for cell in range(9) if codes[cell] != pure and cell not in frozen]
+
+
+class TurnClass:
+    def __init__(self, xstart=True):
+        if xstart:
+            self.player = 'X'
+            self.inactive = 'O'
+        else:
+            self.player = 'O'
+            self.inactive = 'X'
+    def switch(self):
+        self.player, self.inactive = self.inactive, self.player
+
+
+class State:
+    # Una celda: el código es todo su estado cuántico; probs y coefs se derivan de él
+    # con el modelo de peso de la celda (models.py)
+    __slots__ = ('i', 'j', 'code', 'on', 'collapsed', 'model')
+
+    def __init__(self, i, j, model=HALF_POW):
+        self.i = i
+        self.j = j
+        self.code = EMPTY  # Estado exacto de la celda (ver dyadic.py)
+        self.on = False
+        self.collapsed = None
+        self.model = model
+
+    def move(self, turn, w_model=None):
+        # w_model: nombre de un modelo registrado; por defecto el de la celda
+        if w_model is not None:
+            self.model = get_model(w_model)
+        self.code = self.model.next[turn.player][self.code]
+
+    @property
+    def probs(self):
+        return self.model.probs(self.code)
+
+    @property
+    def coefs(self):
+        # Coeficientes sqrt(p), solo se calculan cuando se muestran
+        return {'X': self.probs['X'].sqrt(), 'O': self.probs['O'].sqrt()}
+
+    def collapse(self, draw):
+        # draw: número uniforme en [0, 1) que decide la celda si está en superposición
+        if self.collapsed == None:
+            if self.code == EMPTY:
+                self.collapsed = '-'
+            elif self.code == PURE_X:
+                self.collapsed = 'X'
+            elif self.code == PURE_O:
+                self.collapsed = 'O'
+            elif draw < self.probs['X']:
+                self.collapsed = 'X'
+            else:
+                self.collapsed = 'O'
+
+    def __str__(self):
+        if self.collapsed == None:
+            return f"X: {self.coefs['X']}, O: {self.coefs['O']}"
+        else:
+            return self.collapsed
+
+
+def check_winners(grid):
+    # grid: 3x3 de 'X'/'O'/'-'. Las 8 líneas se cuentan sobre máscaras de bits (bitboard.py)
+    return winner_lookup(*masks(grid))
+
+
+FULL = 0x1FF  # las 9 celdas como bits (celda = 3*fila + columna)
+MASK_MOVES = tuple(tuple(divmod(cell, 3) for cell in range(9) if mask >> cell & 1) for mask in range(512))
+
+
+def frozen_start(plies, last_moves):
+    # Índice de la primera jugada congelada, como moves_log[len(moves_log)-last_moves:]:
+    # con menos de last_moves jugadas el inicio negativo del slice cuenta desde el final
+    if plies >= last_moves:
+        return plies - last_moves
+    return max(0, 2*plies - last_moves)
+
+
+def unpack(codes):
+    # Los 9 códigos (con signo) de un tablero empaquetado por Position
+    return tuple((codes >> (cell << 4) & 0xFFFF) - ((codes >> (cell << 4) & 0x8000) << 1) for cell in range(9))
+
+
+EMPTY_CODES = sum((EMPTY & 0xFFFF) << (cell << 4) for cell in range(9))
+
+
+class Position:
+    # Tablero compacto para búsquedas en unos pocos enteros: los 9 códigos en uno solo (16 bits
+    # por celda, en el orden sin signo con el que se indexan las tablas de models.py) y
+    # máscaras de 9 bits. make/unmake trabajan en sitio: make apila los enteros que cambia
+    # y unmake los recupera, sin recalcular nada.
+    __slots__ = ('last_moves', 'max_turns', 'hardcore', 'next', 'codes', 'player', 'plies', 'log',
+                 'frozen_mask', 'pure_x', 'pure_o', 'played_mask', 'legal_mask', 'undo')
+
+    def __init__(self, rules):
+        self.last_moves = rules['last_moves']
+        self.max_turns = rules['max_turns']
+        self.hardcore = rules.get('hardcore', False) or self.max_turns == HARDCORE
+        self.next = rules_model(rules).next
+        self.codes = EMPTY_CODES
+        self.player = 'X' if rules['xstart'] else 'O'
+        self.plies = 0
+        self.log = []   # celdas jugadas
+        self.undo = []  # (codes, pure_x, pure_o, frozen_mask, played_mask, legal_mask) antes de cada jugada
+        self.frozen_mask = self.pure_x = self.pure_o = self.played_mask = 0
+        self.legal_mask = self.compute_legal_mask()
+
+    def copy(self):
+        new = Position.__new__(Position)
+        for name in Position.__slots__:
+            setattr(new, name, getattr(self, name))
+        new.log, new.undo = self.log[:], self.undo[:]
+        return new
+
+    def code(self, cell):
+        code = self.codes >> (cell << 4) & 0xFFFF
+        return code - 0x10000 if code & 0x8000 else code
+
+    def turns_done(self):
+        if self.hardcore:
+            return self.played_mask == FULL
+        return self.plies >= self.max_turns
+
+    def compute_legal_mask(self):
+        if self.turns_done():
+            return 0
+        return FULL & ~self.frozen_mask & ~(self.pure_x if self.player == 'X' else self.pure_o)
+
+    def make(self, cell):
+        # Juega la celda (sin comprobar legalidad: eso queda para Game.move)
+        codes, pure_x, pure_o, played = self.codes, self.pure_x, self.pure_o, self.played_mask
+        self.undo.append((codes, pure_x, pure_o, self.frozen_mask, played, self.legal_mask))
+        shift, bit = cell << 4, 1 << cell
+        code = codes >> shift & 0xFFFF
+        new = self.next[self.player][code]
+        self.codes = codes ^ (code ^ new & 0xFFFF) << shift
+        pure_x = pure_x | bit if new == PURE_X else pure_x & ~bit
+        pure_o = pure_o | bit if new == PURE_O else pure_o & ~bit
+        played |= bit
+
+        # Congeladas: moves_log[len(moves_log)-last_moves:], con el inicio negativo del slice
+        # contando desde el final si hay menos de last_moves jugadas (ver frozen_start)
+        log = self.log
+        log.append(cell)
+        plies = self.plies = len(log)
+        frozen = 0
+        if self.last_moves:
+            for moved in log[frozen_start(plies, self.last_moves):]:
+                frozen |= 1 << moved
+
+        player = self.player = 'O' if self.player == 'X' else 'X'
+        self.pure_x, self.pure_o, self.frozen_mask, self.played_mask = pure_x, pure_o, frozen, played
+        if played == FULL if self.hardcore else plies >= self.max_turns:
+            self.legal_mask = 0
+        else:
+            self.legal_mask = FULL & ~frozen & ~(pure_x if player == 'X' else pure_o)
+
+    def unmake(self):
+        # Deshace la última jugada de make
+        self.log.pop()
+        self.plies -= 1
+        self.player = 'O' if self.player == 'X' else 'X'
+        self.codes, self.pure_x, self.pure_o, self.frozen_mask, self.played_mask, self.legal_mask = self.undo.pop()
+
+
+def grid_full(moves_log):
+    grid_set=set(((0,0),(0,1),(0,2),(1,0),(1,1),(1,2),(2,0),(2,1),(2,2)))
+    log_set=set(moves_log)
+    return log_set == grid_set
+
+
+class Game:
+    # Una partida a partir de un diccionario de reglas:
+    #   xstart (bool), max_turns (int, HARDCORE para el modo Hardcore),
+    #   last_moves (turnos que una celda queda congelada), hardcore (opcional),
+    #   w_model (opcional, modelo de peso de models.py; 'half_pow' por defecto)
+    # seed: entero o SeedSequence (p. ej. de SeedSequence.spawn en procesos en paralelo).
+    # Con la misma semilla y las mismas jugadas el colapso se repite bit a bit.
+    def __init__(self, rules, seed=None):
+        self.xstart = rules['xstart']
+        self.max_turns = rules['max_turns']
+        self.last_moves = rules['last_moves']
+        self.hardcore = rules.get('hardcore', False) or self.max_turns == HARDCORE
+        self.model = rules_model(rules)
+        self.grid = array([[State(i, j, self.model) for j in range(3)] for i in range(3)])
+        self.turn = TurnClass(xstart=self.xstart)
+        self.moves_log = []
+        self.tracker = LineTracker(self.model)  # probabilidades de líneas y resultados, al día tras cada jugada
+        self.seed = seed if isinstance(seed, SeedSequence) else SeedSequence(seed)
+        self.rng = default_rng(self.seed)
+        # Hash de Zobrist de la posición (y de sus 8 simetrías), al día tras cada jugada
+        self.hash = start_hash(not self.xstart, self.clock())
+        # Legalidad incremental (ver Position): máscaras de 9 bits al día tras cada jugada
+        self.position = Position(rules)
+        self.finished = False  # ya colapsada
+
+    @property
+    def legal_mask(self):
+        return 0 if self.finished else self.position.legal_mask
+
+    def is_legal(self, row, col):
+        return 0 <= row < 3 and 0 <= col < 3 and self.legal_mask >> (3*row + col) & 1 == 1
+
+    def legal_moves(self):
+        # Tupla precalculada para cada máscara: no se crea nada
+        return MASK_MOVES[self.legal_mask]
+
+    def move(self, row, col):
+        if not self.is_legal(row, col):
+            raise ValueError(f"illegal move {(row, col)} for {self.turn.player}")
+        cell = 3*row + col
+        state = self.grid[row, col]
+        old_code, old_window, old_clock = state.code, self.window(), self.clock()
+        self.position.make(cell)
+        state.code = self.position.code(cell)
+        self.tracker.update(cell, state.code)
+        self.moves_log.append((row, col))
+        self.turn.switch()
+        self.hash = self.hash.child(cell, old_code, state.code, old_window, self.window(), old_clock, self.clock())
+
+    def window(self):
+        # Celdas de las últimas last_moves jugadas, la más reciente primero
+        if not self.last_moves:
+            return ()
+        return tuple(3*row + col for row, col in reversed(self.moves_log[-self.last_moves:]))
+
+    def clock(self):
+        # Lo que queda de reloj para el hash: turnos restantes, o en Hardcore las jugadas
+        # hasta llenar la ventana de congelación
+        if self.hardcore:
+            return min(len(self.moves_log), self.last_moves)
+        return self.max_turns - len(self.moves_log)
+
+    def position_key(self):
+        # (hash canónico bajo las 8 simetrías, simetría que lleva a la forma canónica)
+        return self.hash.canonical()
+
+    def turns_done(self):
+        return self.position.turns_done()
+
+    def over(self):
+        # También termina si quien mueve no tiene ninguna jugada legal (partida bloqueada)
+        return self.legal_mask == 0
+
+    def progress(self):
+        # Lo que muestra la cabecera: (turno actual, total) o '>:3' en Hardcore
+        return ((len(self.moves_log)+1), self.max_turns) if not self.hardcore else '>:3'
+
+    def collapsing(self):
+        # Colapsa celda a celda (la interfaz lo anima); los 9 números salen de una sola llamada
+        draws = self.rng.random(9)
+        self.finished = True
+        for cell, (state, draw) in enumerate(zip(self.grid.flat, draws.tolist())):
+            if state.collapsed is None:
+                state.collapse(draw)
+                self.tracker.update(cell, PINNED[state.collapsed])
+            yield state
+
+    def collapse(self):
+        for state in self.collapsing():
+            pass
+
+    def collapsed_grid(self):
+        return array([[state.collapsed for state in row] for row in self.grid])
+
+    def odds(self):
+        # Probabilidad exacta de cada resultado si se colapsara ahora
+        return self.tracker.odds()
+
+    def expected_lines(self):
+        return self.tracker.expected_lines()
+
+    def result(self):
+        # 'Tie', 'X won!' u 'O won!' (colapsa las celdas que falten)
+        self.collapse()
+        return winner_lookup(*masks(self.grid))
@@ -1,45 +1,41 @@
-import pygame
+from startup import phase, prewarm, first_frame, report as startup_report
 
-from matplotlib import use as mpluse
-mpluse("Agg")
-from numpy.random import uniform
-from numpy import array, all, fliplr
-from sympy import latex,Rational,sqrt
-from os import remove
-from sys import exit as close_script
-from matplotlib.pyplot import subplots as pltsubplots
-from matplotlib.pyplot import  close as pltclose
-from tempfile import NamedTemporaryFile
+with phase('import pygame'):
+    import pygame
 
+# numpy (y con él qengine) solo hace falta una vez empieza la partida: se importa al
+# usarse (o en segundo plano cuando el menú ya está en pantalla)
+from sys import argv, exit as close_script
+from time import perf_counter, process_time
+with phase('import board_view'):
+    from board_view import BoardView, BoardRenderer, WIDTH, HEIGHT, WHITE, BLACK, BLUE, GRAY, DARK_GRAY, CELL_SIZE
+    from glyphs import text_cache
 
 
-def main():
-    # Configuración de Pygame
-    pygame.init()
+
+def main(cpu_stats=False, profile_startup=False, background_prewarm=True, native_glyphs=False, ai=None, ai_time=1.0, ai_engine='auto'):
+    # Configuración de Pygame (sin audio: el juego no lo usa y es lo más lento de pygame.init)
+    with phase('pygame display/font init'):
+        pygame.display.init()
+        pygame.font.init()
 
     # Dimensiones de la ventana
-    WIDTH, HEIGHT = 600, 600+100
-    WIN = pygame.display.set_mode((WIDTH, HEIGHT))
-    pygame.display.set_caption("Quantum Tic-Tac-Toe")
-
-    # Colores
-    WHITE = (255, 255, 255)
-    BLACK = (0, 0, 0)
-    RED = (255, 0, 0)
-    BLUE = (0, 0, 255)
-    GRAY = (200, 200, 200)
-    DARK_GRAY = (100, 100, 100)
-
-    # Dimensiones de la cuadrícula
-    GRID_SIZE = 3
-    CELL_SIZE = WIDTH // GRID_SIZE
+    with phase('set_mode'):
+        WIN = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Quantum Tic-Tac-Toe")
 
     # Fuentes
-    FONT = pygame.font.SysFont("comicsans", 40)
-    SMALLFONT = pygame.font.SysFont("comicsans", 25)
+    with phase('fonts'):
+        FONT = pygame.font.SysFont("comicsans", 40)
+        SMALLFONT = pygame.font.SysFont("comicsans", 25)
 
     clock = pygame.time.Clock()
 
+    # Tablero (cuadrícula, coeficientes, turno y ganador)
+    with phase('BoardView (atlas)'):
+        view = BoardView(WIN, FONT, SMALLFONT, glyphs='native' if native_glyphs else 'mathtext')
+    draw_turn, draw_winner = view.draw_turn, view.draw_winner
+
     # Pygame classes and functions:
     class Button:
         def __init__(self, text, x, y, width, height, inactive_color, active_color, action=None):
@@ -87,7 +83,7 @@ def main():
             pygame.draw.circle(screen, BLUE, handle_center, 15)
             
             # Mostrar el valor seleccionado
-            value_text = SMALLFONT.render(f"{self.name}: {self.value}", True, BLACK)
+            value_text = text_cache.render(SMALLFONT, f"{self.name}: {self.value}", True, BLACK)
             screen.blit(value_text, (self.x + self.width // 2 - value_text.get_width() // 2, self.y + 50))
 
         def handle_event(self, event):
@@ -138,185 +134,99 @@ def main():
                     if button_rect.collidepoint(event.pos):
                         self.selected_option = option
 
-    def render_latex_to_image(expression,colors, fontsize=15, dpi=100):
-        fig, ax = pltsubplots(figsize=(1, 1), dpi=dpi)
-        xpos=0
-        for ket,col in zip(expression,colors):
-            text_obj=ax.text(xpos, 0, f"${ket}$",color=col, fontsize=fontsize, ha='left', va='center')
-            bbox = text_obj.get_window_extent()  # Obtiene el bbox en puntos de pantalla
-            text_width = bbox.width / dpi  # Convierte a pulgadas
-            xpos += (text_width+0.2)
-        ax.axis('off')  # Oculta los ejes
-
-        with NamedTemporaryFile(suffix=".png", delete=False) as tmpfile:
-            fig.savefig(tmpfile.name, bbox_inches='tight', pad_inches=0, transparent=True)
-            pltclose(fig)
-            #print(tmpfile.name)
-            return tmpfile.name 
-
     def draw_text(text, font, color, surface, x, y):
-        textobj = font.render(text, True, color)
+        textobj = text_cache.render(font, text, True, color)
         textrect = textobj.get_rect()
         textrect.center = (x, y)
         surface.blit(textobj, textrect)
 
-    def draw_turn(turn,progress):
-        turn_text = f"Turn: {turn.player}"
-        text_1 =   SMALLFONT.render(turn_text, 1, BLACK)
-        WIN.blit(text_1, (WIDTH // 2 - text_1.get_width() // 2-150, 10))
-
-        if progress == '>:3':
-            progress_text = progress
-        else:
-            progress_text = f"Progress: {progress[0]}/{progress[1]}"
+    # Screens:
+    class ScreenLoop:
+        # Bucle de pantalla dirigido por eventos: bloquea en pygame.event.wait y solo
+        # redibuja cuando algo cambió. Sin foco (o minimizada) se despierta aún menos.
+        FOCUSED_TIMEOUT = 250     # ms
+        UNFOCUSED_TIMEOUT = 2000  # ms
 
-        text_2 = SMALLFONT.render(progress_text, 1, BLACK)
-        WIN.blit(text_2, (WIDTH // 2 - text_2.get_width() // 2+150, 10))
-        
-    def draw_winner(winner):
-        winner_text = f"{winner}"
-        text = FONT.render(winner_text, 1, BLACK)
-        WIN.blit(text, (WIDTH // 2 - text.get_width() // 2, 10))
-
-    def draw_grid():
-        WIN.fill(WHITE)
-        for x in range(1, GRID_SIZE):
-            pygame.draw.line(WIN, BLACK, (x * CELL_SIZE, 100), (x * CELL_SIZE, HEIGHT), 3)
-            pygame.draw.line(WIN, BLACK, (0, x * CELL_SIZE+100), (WIDTH, x * CELL_SIZE+100), 3)
-
-    def draw_state(grid):
-        for i in range(GRID_SIZE):
-            for j in range(GRID_SIZE):
-                state = grid[i, j]
-                if state.collapsed:
-                    text = FONT.render(state.collapsed, 1, RED if state.collapsed == 'X' else BLUE)
-                    WIN.blit(text, (j * CELL_SIZE + CELL_SIZE // 3, i * CELL_SIZE + CELL_SIZE // 4+100))
-                else:
-                    # Generar la expresión LaTeX solo con los kets con coeficientes no nulos
-                    expression = []
-                    colors=[]
-                    
-                    if state.coefs['X'] != 0:
-                        expression.append(f"{ latex(state.coefs['X'])}|X\\rangle")
-                        colors.append('red')
-                    if state.coefs['O'] != 0:
-                        expression.append(f"{ latex(state.coefs['O'])}|O\\rangle")
-                        colors.append('blue')
-                    if state.coefs['O'] != 0 and state.coefs['X'] != 0:
-                        expression.insert(1,' + ')
-                        colors.insert(1,'black')
-
-                    if expression:  # Si hay algo que mostrar
-                        img_path = render_latex_to_image(expression,colors, fontsize=20)
-                        img = pygame.image.load(img_path)
-                        WIN.blit(img, (j * CELL_SIZE + 10, i * CELL_SIZE + 20+100))
-                        remove(img_path)
-                        
-
-
-    # Backend classes and functions:
-    class TurnClass:
-        def __init__(self, xstart=True):
-            if xstart:
-                self.player = 'X'
-                self.inactive = 'O'
-            else:
-                self.player = 'O'
-                self.inactive = 'X'
-        def switch(self):
-            self.player, self.inactive = self.inactive, self.player
-
-    class State:
-        def __init__(self, i, j):
-            self.i = i
-            self.j = j
-            self.probs = {'X': 0, 'O': 0}
-            self.coefs = {'X': 0, 'O': 0}
-            self.on = False
-            self.collapsed = None
-            
-        def move(self, turn, w_model='half_pow'):
-            if w_model == 'half_pow':
-                if self.probs[turn.player] == 0:
-                    if self.probs[turn.inactive] == 0:
-                        self.probs[turn.player] = 1
-                    else:
-                        self.probs = {'X':  Rational(1/2), 'O':  Rational(1/2)}
-                else:
-                    if self.probs[turn.player] >= self.probs[turn.inactive]:
-                        self.probs[turn.inactive] =  Rational(self.probs[turn.inactive]/2)
-                        self.probs[turn.player] = 1 - self.probs[turn.inactive]
-                    else:
-                        self.probs[turn.player] =  Rational(self.probs[turn.player]*2)
-                        self.probs[turn.inactive] = 1 - self.probs[turn.player]
-                        
-                self.coefs[turn.player] =  sqrt(self.probs[turn.player])
-                self.coefs[turn.inactive] =  sqrt(self.probs[turn.inactive])
-                
-        def collapse(self):
-            if self.collapsed == None:
-                if self.probs['X'] + self.probs['O'] == 0:
-                    self.collapsed = '-'
-                elif self.probs['X'] == 1:
-                    self.collapsed = 'X'
-                elif self.probs['O'] == 1:
-                    self.collapsed = 'O'
-                else:
-                    montecarlo = uniform(low=0.0, high=1.0, size=None)
-                    if montecarlo < self.probs['X']:
-                        self.collapsed = 'X'
-                    else:
-                        self.collapsed = 'O'
-
-        def __str__(self):
-            if self.collapsed == None:
-                return f"X: {self.coefs['X']}, O: {self.coefs['O']}"
-            else:
-                return self.collapsed
-
-    def check_winners(grid):
-        Xwins = 0
-        Owins = 0
-        # Check rows
-        for i in range(3):
-            row = grid[i, :]
-            if all(row == 'X'):
-                Xwins += 1
-            elif all(row == 'O'):
-                Owins += 1 
-        # Check columns
-        for j in range(3):
-            col = grid[:, j]
-            if all(col == 'X'):
-                Xwins += 1
-            elif all(col == 'O'):
-                Owins += 1 
-        # Check diagonals
-        diagonal = grid.diagonal()
-        antidiagonal = fliplr(grid).diagonal()
-        if all(diagonal == 'X'):
-            Xwins += 1
-        elif all(diagonal == 'O'):
-            Owins += 1 
-        if all(antidiagonal == 'X'):
-            Xwins += 1
-        elif all(antidiagonal == 'O'):
-            Owins += 1 
-        
-        if Owins==Xwins:
-            return 'Tie'
-        if Owins<Xwins:
-            return 'X won!'
-        if Owins>Xwins:
-            return 'O won!'
+        def __init__(self, name):
+            self.name = name
+            self.dirty = True
+            self.frames = 0
+            self.cpu = 0.0
+            self.wall = 0.0
+            self._start()
+
+        def _start(self):
+            self._cpu0 = process_time()
+            self._wall0 = perf_counter()
+
+        def _stop(self):
+            self.cpu += process_time() - self._cpu0
+            self.wall += perf_counter() - self._wall0
+
+        def events(self):
+            focused = pygame.display.get_active() and pygame.key.get_focused()
+            event = pygame.event.wait(self.FOCUSED_TIMEOUT if focused else self.UNFOCUSED_TIMEOUT)
+            events = ([event] if event.type != pygame.NOEVENT else []) + pygame.event.get()
+            for event in events:
+                if event.type == pygame.QUIT:
+                    self.close()
+                    pygame.quit()
+                    close_script()
+                if event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWFOCUSGAINED):
+                    self.dirty = True
+            return events
 
-    def grid_full(moves_log):
-        grid_set=set(((0,0),(0,1),(0,2),(1,0),(1,1),(1,2),(2,0),(2,1),(2,2)))
-        log_set=set(moves_log)
-        return log_set == grid_set
+        def should_draw(self):
+            # Minimizada no se dibuja; al restaurarse llega WINDOWRESTORED
+            return self.dirty and pygame.display.get_active()
 
+        def flip(self):
+            pygame.display.update()
+            self.frames += 1
+            self.dirty = False
+            if first_frame():
+                on_first_frame()
+            clock.tick(60)  # Tope de frames mientras llegan ráfagas de eventos
+
+        def child(self, screen):
+            # Pantalla anidada: su tiempo no cuenta para esta, y al volver hay que redibujar
+            self._stop()
+            result = screen()
+            self._start()
+            self.dirty = True
+            return result
+
+        def close(self):
+            self._stop()
+            if cpu_stats:
+                usage = self.cpu / self.wall if self.wall else 0.0
+                print(f"{self.name}: {usage:.1%} CPU ({self.cpu:.3f}s over {self.wall:.1f}s, {self.frames} frames)")
+
+    def on_first_frame():
+        if profile_startup:
+            startup_report()
+        if background_prewarm:
+            # matplotlib solo se usa para etiquetas que no están en el atlas (nunca con glifos nativos)
+            modules = ['qengine'] if view.atlas or native_glyphs else ['qengine', 'matplotlib.figure', 'matplotlib.backends.backend_agg']
+            prewarm(*modules)
+
+    def clicked(events):
+        # Posición del click izquierdo de este lote de eventos (o None)
+        for event in events:
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                return event.pos
+        return None
+
+    def draw_play_back():
+        play_button = pygame.Rect(WIDTH // 2 - 75+90, HEIGHT - 100, 150, 50)
+        pygame.draw.rect(WIN, DARK_GRAY, play_button)
+        draw_text("Play", SMALLFONT, WHITE, WIN, play_button.centerx, play_button.centery)
+
+        back_button = pygame.Rect(WIDTH // 2 - 75 -90, HEIGHT - 100, 150, 50)
+        pygame.draw.rect(WIN, DARK_GRAY, back_button)
+        draw_text("Back", SMALLFONT, WHITE, WIN, back_button.centerx, back_button.centery)
+        return play_button, back_button
 
-    # Screens:
     def config():
         buttons = [
             Button("Standard Rules", WIDTH // 2 - 150, HEIGHT // 2 - 50, 300, 50, GRAY, DARK_GRAY, action="standard"),
@@ -324,260 +234,235 @@ def main():
             Button("Hardcore", WIDTH // 2 - 150, HEIGHT // 2 + 90, 300, 50, GRAY, DARK_GRAY, action="hardcore"),
             Button("Quit", WIDTH // 2 - 150, HEIGHT // 2 + 160, 300, 50, GRAY, DARK_GRAY, action="quit")
         ]
+        loop = ScreenLoop('config')
+        mouse_pos = pygame.mouse.get_pos()
         exit = False
         while True and not exit:
-            WIN.fill(WHITE)
-            draw_text('Quantum Tic-Tac-Toe', FONT, BLACK, WIN, WIDTH // 2, HEIGHT // 4)
-
-            mouse_pos = pygame.mouse.get_pos()
-            click = pygame.mouse.get_pressed()
-
-            for button in buttons:
-                action = button.draw(WIN, mouse_pos, click)
-                if action:
-                    if action == "quit":
-                        pygame.quit()
-                        close_script()
-
-                    else:
-                        if action == 'standard':
-                            rules,exit = stardard_settings_menu()
-
-                        if action == 'custom':
-                            rules,exit = custom_settings_menu()
-
-                        if action == 'hardcore':
-                            rules,exit = hardcore_settings_menu()
-
-            
-            pygame.display.update()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    close_script()
+            events = loop.events()
+            for event in events:
+                if event.type == pygame.MOUSEMOTION:
+                    # Solo hace falta redibujar si cambia el botón resaltado
+                    if [b.is_hovered(event.pos) for b in buttons] != [b.is_hovered(mouse_pos) for b in buttons]:
+                        loop.dirty = True
+                    mouse_pos = event.pos
+
+            pos = clicked(events)
+            action = next((button.action for button in buttons if pos and button.is_hovered(pos)), None)
+            if action == "quit":
+                loop.close()
+                pygame.quit()
+                close_script()
+            if action == 'standard':
+                rules,exit = loop.child(stardard_settings_menu)
+            if action == 'custom':
+                rules,exit = loop.child(custom_settings_menu)
+            if action == 'hardcore':
+                rules,exit = loop.child(hardcore_settings_menu)
+
+            if loop.should_draw() and not exit:
+                mouse_pos = pygame.mouse.get_pos()
+                WIN.fill(WHITE)
+                draw_text('Quantum Tic-Tac-Toe', FONT, BLACK, WIN, WIDTH // 2, HEIGHT // 4)
+                for button in buttons:
+                    button.draw(WIN, mouse_pos, (0, 0, 0))
+                loop.flip()
 
+        loop.close()
         return rules
 
     def custom_settings_menu():
         slider1 = Slider('Number of turns',min_value=10, max_value=30, step=2, x=WIDTH//2 - WIDTH//4, y=100, width=WIDTH//2, height=30)
         slider2 = Slider('Cell freezing time (turns)',min_value=0, max_value=8, step=1, x=WIDTH//2 - WIDTH//4, y=100+130, width=WIDTH//2, height=30)
         category_selector = Selector(x=WIDTH//2 - WIDTH//4, y=100+130+130, width=WIDTH//2, height=50, options=["X Starts", "O Starts"])
+        loop = ScreenLoop('custom_settings_menu')
         
         while True:
-            WIN.fill(WHITE)
-            slider1.draw(WIN)
-            slider2.draw(WIN)
-            category_selector.draw(WIN)
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    close_script()
+            events = loop.events()
+            before = (slider1.handle_x, slider2.handle_x, category_selector.selected_option)
+            for event in events:
                 slider1.handle_event(event)
                 slider2.handle_event(event)
                 category_selector.handle_event(event)
-                
-            # Mostrar botón de confirmación
-            mouse_pos = pygame.mouse.get_pos()
-            click = pygame.mouse.get_pressed()
-            
+            if (slider1.handle_x, slider2.handle_x, category_selector.selected_option) != before:
+                loop.dirty = True
+
+            if loop.should_draw():
+                WIN.fill(WHITE)
+                slider1.draw(WIN)
+                slider2.draw(WIN)
+                category_selector.draw(WIN)
+                draw_play_back()
+                loop.flip()
+
+            # Botones de confirmación
+            pos = clicked(events)
             play_button = pygame.Rect(WIDTH // 2 - 75+90, HEIGHT - 100, 150, 50)
-            pygame.draw.rect(WIN, DARK_GRAY, play_button)
-            draw_text("Play", SMALLFONT, WHITE, WIN, play_button.centerx, play_button.centery)
-            
             back_button = pygame.Rect(WIDTH // 2 - 75 -90, HEIGHT - 100, 150, 50)
-            pygame.draw.rect(WIN, DARK_GRAY, back_button)
-            draw_text("Back", SMALLFONT, WHITE, WIN, back_button.centerx, back_button.centery)
 
-            if play_button.collidepoint(mouse_pos) and click[0]:
+            if pos and play_button.collidepoint(pos):
                 rules = {'xstart':category_selector.selected_option == 'X' ,'max_turns': slider1.value,'last_moves': slider2.value}
                 WIN.fill(WHITE)
+                loop.close()
                 return rules,True   # Regresar el valor seleccionado cuando se presiona el botón de confirmación
             
-            if back_button.collidepoint(mouse_pos) and click[0]:
+            if pos and back_button.collidepoint(pos):
                 rules = None
                 WIN.fill(WHITE)
+                loop.close()
                 return rules,False   # Regresar el valor seleccionado cuando se presiona el botón de confirmación
-            
-
-            pygame.display.update()
 
     def stardard_settings_menu():
+        loop = ScreenLoop('stardard_settings_menu')
         while True:
-            WIN.fill(WHITE)
-            draw_text("Standard rules:", FONT, BLACK, WIN, WIDTH // 2, HEIGHT // 4)
-            draw_text("Game lasts for 14 turns", SMALLFONT, BLACK, WIN, WIDTH // 2, HEIGHT // 3+50)
-            draw_text("Cells freeze for 1 turn after being played", SMALLFONT, BLACK, WIN, WIDTH // 2, HEIGHT // 3+100)
-            draw_text("X starts!", SMALLFONT, BLACK, WIN, WIDTH // 2, HEIGHT // 3+150)
-            
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    close_script()
-            # Mostrar botón de confirmación
-            mouse_pos = pygame.mouse.get_pos()
-            click = pygame.mouse.get_pressed()
-            
+            events = loop.events()
+            if loop.should_draw():
+                WIN.fill(WHITE)
+                draw_text("Standard rules:", FONT, BLACK, WIN, WIDTH // 2, HEIGHT // 4)
+                draw_text("Game lasts for 14 turns", SMALLFONT, BLACK, WIN, WIDTH // 2, HEIGHT // 3+50)
+                draw_text("Cells freeze for 1 turn after being played", SMALLFONT, BLACK, WIN, WIDTH // 2, HEIGHT // 3+100)
+                draw_text("X starts!", SMALLFONT, BLACK, WIN, WIDTH // 2, HEIGHT // 3+150)
+                draw_play_back()
+                loop.flip()
+
+            # Botones de confirmación
+            pos = clicked(events)
             play_button = pygame.Rect(WIDTH // 2 - 75+90, HEIGHT - 100, 150, 50)
-            pygame.draw.rect(WIN, DARK_GRAY, play_button)
-            draw_text("Play", SMALLFONT, WHITE, WIN, play_button.centerx, play_button.centery)
-            
             back_button = pygame.Rect(WIDTH // 2 - 75 -90, HEIGHT - 100, 150, 50)
-            pygame.draw.rect(WIN, DARK_GRAY, back_button)
-            draw_text("Back", SMALLFONT, WHITE, WIN, back_button.centerx, back_button.centery)
 
-            if play_button.collidepoint(mouse_pos) and click[0]:
+            if pos and play_button.collidepoint(pos):
                 rules = {'xstart':True ,'max_turns': 14,'last_moves': 1}
                 WIN.fill(WHITE)
+                loop.close()
                 return rules,True   # Regresar el valor seleccionado cuando se presiona el botón de confirmación
             
-            if back_button.collidepoint(mouse_pos) and click[0]:
+            if pos and back_button.collidepoint(pos):
                 rules = None
                 WIN.fill(WHITE)
+                loop.close()
                 return rules,False   # Regresar el valor seleccionado cuando se presiona el botón de confirmación
-            
-
-            pygame.display.update()
 
     def hardcore_settings_menu():
         category_selector = Selector(x=WIDTH//2 - WIDTH//4, y=HEIGHT // 3+150, width=WIDTH//2, height=50, options=["X Starts", "O Starts"])
+        loop = ScreenLoop('hardcore_settings_menu')
             
         while True:
-            WIN.fill(WHITE)
-            draw_text("Hardcore mode:", FONT, BLACK, WIN, WIDTH // 2, HEIGHT // 4)
-            draw_text("Game finishes once the grid is full", SMALLFONT, BLACK, WIN, WIDTH // 2, HEIGHT // 3+50)
-            draw_text("Cells freeze for 1 turn after being played", SMALLFONT, BLACK, WIN, WIDTH // 2, HEIGHT // 3+100)
-            #draw_text("X starts!", SMALLFONT, BLACK, WIN, WIDTH // 2, HEIGHT // 3+150)
-            category_selector.draw(WIN)
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    close_script()
+            events = loop.events()
+            before = category_selector.selected_option
+            for event in events:
                 category_selector.handle_event(event)
-            # Mostrar botón de confirmación
-            
-            mouse_pos = pygame.mouse.get_pos()
-            click = pygame.mouse.get_pressed()
-            
+            if category_selector.selected_option != before:
+                loop.dirty = True
+
+            if loop.should_draw():
+                WIN.fill(WHITE)
+                draw_text("Hardcore mode:", FONT, BLACK, WIN, WIDTH // 2, HEIGHT // 4)
+                draw_text("Game finishes once the grid is full", SMALLFONT, BLACK, WIN, WIDTH // 2, HEIGHT // 3+50)
+                draw_text("Cells freeze for 1 turn after being played", SMALLFONT, BLACK, WIN, WIDTH // 2, HEIGHT // 3+100)
+                #draw_text("X starts!", SMALLFONT, BLACK, WIN, WIDTH // 2, HEIGHT // 3+150)
+                category_selector.draw(WIN)
+                draw_play_back()
+                loop.flip()
+
+            # Botones de confirmación
+            pos = clicked(events)
             play_button = pygame.Rect(WIDTH // 2 - 75+90, HEIGHT - 100, 150, 50)
-            pygame.draw.rect(WIN, DARK_GRAY, play_button)
-            draw_text("Play", SMALLFONT, WHITE, WIN, play_button.centerx, play_button.centery)
-            
             back_button = pygame.Rect(WIDTH // 2 - 75 -90, HEIGHT - 100, 150, 50)
-            pygame.draw.rect(WIN, DARK_GRAY, back_button)
-            draw_text("Back", SMALLFONT, WHITE, WIN, back_button.centerx, back_button.centery)
 
-            if play_button.collidepoint(mouse_pos) and click[0]:
+            if pos and play_button.collidepoint(pos):
                 rules = {'xstart':category_selector.selected_option == 'X'  ,'max_turns': -137,'last_moves': 1} # -137 being used as an indicator for Hardcore mode
                 WIN.fill(WHITE)
+                loop.close()
                 return rules,True   # Regresar el valor seleccionado cuando se presiona el botón de confirmación
             
-            if back_button.collidepoint(mouse_pos) and click[0]:
+            if pos and back_button.collidepoint(pos):
                 rules = None
                 WIN.fill(WHITE)
+                loop.close()
                 return rules,False   # Regresar el valor seleccionado cuando se presiona el botón de confirmación
-            
-
-            pygame.display.update()
 
 
 
     def game(rules):
-        xstart=rules['xstart']
-        max_turns=rules['max_turns']
-        last_moves=rules['last_moves']
-        run = True
-        hardcore = max_turns == -137
-
-        # Inicialización de Grid y Turno
-        state00 = State(0, 0)
-        state01 = State(0, 1)
-        state02 = State(0, 2)
-        state10 = State(1, 0)
-        state11 = State(1, 1)
-        state12 = State(1, 2)
-        state20 = State(2, 0)
-        state21 = State(2, 1)
-        state22 = State(2, 2)
-        grid = array([[state00, state01, state02], [state10, state11, state12], [state20, state21, state22]])
-
-        turn = TurnClass(xstart=xstart)
-        moves_log = []
-        
-        progress=((len(moves_log)+1),max_turns) if not hardcore else '>:3'
-        draw_turn(turn,progress)
-        pygame.display.update()
+        from qengine import Game
+        board = Game(rules)
+        renderer = BoardRenderer(view)
+        computer = None
+        if ai:
+            # Oponente: juega con `ai` ('X' u 'O') y piensa ai_time segundos por jugada.
+            # Por defecto alfa-beta en Hardcore y MCTS con turnos fijos
+            if ai_engine == 'alphabeta' or (ai_engine == 'auto' and board.hardcore):
+                from alphabeta import AlphaBetaPlayer
+                computer = AlphaBetaPlayer(rules, budget=ai_time)
+            else:
+                from mcts import MCTSPlayer
+                computer = MCTSPlayer(rules, budget=ai_time)
+
+        def draw_frame(show_turn=True):
+            if show_turn:
+                progress = board.progress()
+                dirty = renderer.render(board.grid, (board.turn.player, progress), lambda: draw_turn(board.turn.player,progress))
+            else:
+                dirty = renderer.render(board.grid)
+            if dirty:
+                pygame.display.update(dirty)
+
+        draw_frame()
 
-        while run and ((hardcore and (not grid_full(moves_log))) or len(moves_log) < max_turns ) :
+        while not board.over():
             clock.tick(60)
+
+            if computer and board.turn.player == ai:
+                board.move(*computer.choose(board))
+                pygame.event.clear(pygame.MOUSEBUTTONDOWN)  # clics hechos mientras pensaba
+                if not board.over():
+                    draw_frame()
+                continue
             
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    run = False
                     pygame.quit()
                     close_script()
 
-                    
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     pos = pygame.mouse.get_pos()
                     col = pos[0] // CELL_SIZE
                     row = (pos[1]-100) // CELL_SIZE
 
-                    if grid[row, col].collapsed is None and grid[row, col].probs[turn.player] < 1 and ((row,col) not in moves_log[len(moves_log)-last_moves:]) and row>=0:
-                        grid[row, col].move(turn)
-                        moves_log.append((row, col))
-                        turn.switch()
-
-            if ((hardcore and (not grid_full(moves_log))) or len(moves_log) < max_turns ):
-                draw_grid()
-                draw_state(grid)
-                progress=((len(moves_log)+1),max_turns) if not hardcore else '>:3'
-                draw_turn(turn,progress)
-                pygame.display.update()
-            else:
-                break
+                    if board.is_legal(row, col):
+                        board.move(row, col)
 
-        draw_grid()
-        draw_state(grid)
-        pygame.display.update()
-        pygame.time.wait(1000)
+            if not board.over():
+                draw_frame()
 
-        for i in range(3):
-            for j in range(3):
-                grid[i, j].collapse()
-                draw_grid()
-                draw_state(grid)
-                pygame.display.update()
-                pygame.time.wait(500)
+        if computer:
+            if cpu_stats:
+                print(f"[ai] {computer.stats()}")
+            computer.close()
+        draw_frame(show_turn=False)
+        pygame.time.wait(1000)
 
-        grid_collapsed=array([[state00.collapsed,state01.collapsed,state02.collapsed],[state10.collapsed,state11.collapsed,state12.collapsed],[state20.collapsed,state21.collapsed,state22.collapsed]])
+        for state in board.collapsing():
+            draw_frame(show_turn=False)
+            pygame.time.wait(500)
 
-        winner = check_winners(grid_collapsed)
+        winner = board.result()
         
-        draw_winner(winner)
-        pygame.display.update()
-        back=False
+        dirty = renderer.render(board.grid, winner, lambda: draw_winner(winner))
+        pygame.display.update(dirty)
         # Espera para mostrar el resultado final
-        while not back:
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    close_script()
-
-            mouse_pos = pygame.mouse.get_pos()
-            click = pygame.mouse.get_pressed()
-            
-            back_button = pygame.Rect(WIDTH // 2 - 50 // 2+150,20,150, 50)
-            #back_button = pygame.Rect(WIDTH // 2 - 75 -90, HEIGHT - 100, 150, 50)
-            pygame.draw.rect(WIN, DARK_GRAY, back_button)
-            draw_text("Back", SMALLFONT, WHITE, WIN, back_button.centerx, back_button.centery)
-            pygame.display.update()
-            if back_button.collidepoint(mouse_pos) and click[0]:
-                back=True   # Regresar el valor seleccionado cuando se presiona el botón de confirmación
-        
-        
+        loop = ScreenLoop('game over')
+        back_button = pygame.Rect(WIDTH // 2 - 50 // 2+150,20,150, 50)
+        #back_button = pygame.Rect(WIDTH // 2 - 75 -90, HEIGHT - 100, 150, 50)
+        while True:
+            events = loop.events()
+            if loop.should_draw():
+                pygame.draw.rect(WIN, DARK_GRAY, back_button)
+                draw_text("Back", SMALLFONT, WHITE, WIN, back_button.centerx, back_button.centery)
+                loop.flip()
+            pos = clicked(events)
+            if pos and back_button.collidepoint(pos):
+                break   # Regresar el valor seleccionado cuando se presiona el botón de confirmación
+        loop.close()
 
     # main flux
     while True:
@@ -586,4 +471,8 @@ def main():
     
 
 if __name__ == "__main__":
-    main()
+    main(cpu_stats='--cpu-stats' in argv, profile_startup='--profile-startup' in argv,
+         background_prewarm='--no-prewarm' not in argv, native_glyphs='--native-glyphs' in argv,
+         ai=next((a.split('=')[1] for a in argv if a.startswith('--ai=')), None),
+         ai_time=float(next((a.split('=')[1] for a in argv if a.startswith('--ai-time=')), 1.0)),
+         ai_engine=next((a.split('=')[1] for a in argv if a.startswith('--ai-engine=')), 'auto'))
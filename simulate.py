@@ -0,0 +1,150 @@
+# Simulación Monte Carlo en paralelo: muchas partidas completas con unas reglas y
+# políticas de jugada dadas. Cada bloque de partidas se juega con BatchGames en un
+# proceso del pool y escribe resultado y duración en memoria compartida; las tasas,
+# sus intervalos de confianza y el histograma de duraciones se van imprimiendo
+# según terminan los bloques. Las partidas que llegan a --max-plies sin terminar (en
+# Hardcore dos políticas pueden no llenar nunca la cuadrícula) cuentan aparte.
+#
+#   python simulate.py [games] [--rules=standard|hardcore|custom] [--max-turns=N]
+#                      [--last-moves=N] [--o-starts] [--x-policy=random|greedy]
+#                      [--o-policy=...] [--model=half_pow|counter] [--workers=N]
+#                      [--chunk=N] [--seed=N] [--max-plies=N]
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+from os import cpu_count
+from sys import argv
+from time import perf_counter
+
+import numpy as np
+
+from batch import BatchGames
+from bitboard import RESULTS, TIE, X_WON, O_WON
+from models import MODELS
+from policies import POLICIES, play
+from qengine import STANDARD_RULES, HARDCORE_RULES
+
+Z95 = 1.96
+CAPPED = 3  # resultado de las partidas cortadas en max_plies, tras TIE, X_WON y O_WON
+MAX_PLIES = 1000
+HISTOGRAM_EVERY = 10.0  # segundos entre histogramas parciales
+
+
+def buffers(shm, games):
+    # Duración (int32) y resultado (int8) de cada partida dentro de un mismo bloque de memoria
+    lengths = np.ndarray((games,), dtype=np.int32, buffer=shm.buf)
+    outcomes = np.ndarray((games,), dtype=np.int8, buffer=shm.buf, offset=4 * games)
+    return outcomes, lengths
+
+
+def run_chunk(shm_name, games, first, count, rules, x_policy, o_policy, seed, max_plies):
+    # Trabajo de un proceso: juega `count` partidas y las guarda a partir de `first`
+    batch = BatchGames(count, rules, seed=seed)
+    play(batch, batch.rng, x_policy, o_policy, max_plies)
+    batch.collapse()
+    shm = SharedMemory(name=shm_name)
+    outcomes, lengths = buffers(shm, games)
+    outcomes[first:first + count] = np.where(batch.finished(), batch.outcomes(), CAPPED)
+    lengths[first:first + count] = batch.ply
+    del outcomes, lengths
+    shm.close()
+    return first, count
+
+
+def interval(hits, total):
+    p = hits / total
+    return p, Z95 * (p * (1 - p) / total) ** 0.5
+
+
+def report(counts, done, elapsed):
+    rates = '  '.join(f"{RESULTS[result]} {100 * p:5.2f}% ±{100 * half:.2f}"
+                      for result in (X_WON, O_WON, TIE)
+                      for p, half in [interval(counts[result], done)])
+    if counts[CAPPED]:
+        rates += f"  capped {100 * counts[CAPPED] / done:5.2f}%"
+    print(f"{done:>10d} games  {rates}  ({done / elapsed:,.0f} games/s)", flush=True)
+
+
+def histogram(counts, width=40):
+    # counts[duración] = partidas con esa duración
+    print("game length:")
+    top = counts.max()
+    for length, count in enumerate(counts):
+        if count:
+            print(f"{length:4d} {'#' * max(1, round(width * count / top)):{width}s} {count}")
+
+
+def simulate(games, rules, x_policy='random', o_policy='random', workers=None, chunk=20_000, seed=None,
+             max_plies=MAX_PLIES):
+    # Devuelve (resultados, duraciones, semilla) de las `games` partidas; las cortadas en
+    # max_plies tienen resultado CAPPED. Sin semilla se toma entropía del sistema y se
+    # devuelve para poder repetir la simulación. Con la misma semilla y el mismo `chunk` el
+    # resultado es idéntico sea cual sea el número de procesos
+    starts = range(0, games, chunk)
+    root = np.random.SeedSequence(seed)
+    seeds = root.spawn(len(starts))
+    shm = SharedMemory(create=True, size=5 * games)
+    try:
+        outcomes, lengths = buffers(shm, games)
+        counts = np.zeros(4, dtype=np.int64)
+        length_counts = np.zeros(0, dtype=np.int64)
+        done = 0
+        start = shown = perf_counter()
+        with ProcessPoolExecutor(max_workers=workers or cpu_count()) as pool:
+            jobs = [pool.submit(run_chunk, shm.name, games, first, min(chunk, games - first),
+                                rules, x_policy, o_policy, child, max_plies)
+                    for first, child in zip(starts, seeds)]
+            for job in as_completed(jobs):
+                first, count = job.result()
+                counts += np.bincount(outcomes[first:first + count], minlength=4)
+                chunk_lengths = np.bincount(lengths[first:first + count])
+                length_counts = np.pad(length_counts, (0, max(0, len(chunk_lengths) - len(length_counts))))
+                length_counts[:len(chunk_lengths)] += chunk_lengths
+                done += count
+                now = perf_counter()
+                report(counts, done, now - start)
+                if done == games or now - shown >= HISTOGRAM_EVERY:
+                    histogram(length_counts)
+                    shown = now
+        results = outcomes.copy(), lengths.copy(), root.entropy
+        del outcomes, lengths
+    finally:
+        shm.close()
+        shm.unlink()
+    return results
+
+
+def option(name, default, kind=str):
+    # Valor de --name=valor en la línea de comandos
+    for arg in argv[1:]:
+        if arg.startswith(f'--{name}='):
+            return kind(arg.split('=', 1)[1])
+    return default
+
+
+if __name__ == "__main__":
+    args = [a for a in argv[1:] if not a.startswith('--')]
+    games = int(args[0]) if args else 100_000
+    mode = option('rules', 'standard')
+    if mode == 'hardcore':
+        rules = dict(HARDCORE_RULES)
+    else:
+        rules = dict(STANDARD_RULES)
+        if mode == 'custom':
+            rules['max_turns'] = option('max-turns', rules['max_turns'], int)
+    rules['last_moves'] = option('last-moves', rules['last_moves'], int)
+    rules['xstart'] = '--o-starts' not in argv
+    rules['w_model'] = option('model', 'half_pow')
+    if rules['w_model'] not in MODELS:
+        raise SystemExit(f"unknown weight model {rules['w_model']!r}, choose from {', '.join(MODELS)}")
+    x_policy, o_policy = option('x-policy', 'random'), option('o-policy', 'random')
+    for policy in (x_policy, o_policy):
+        if policy not in POLICIES:
+            raise SystemExit(f"unknown policy {policy!r}, choose from {', '.join(POLICIES)}")
+
+    # Sin --seed se imprime la entropía usada: --seed=<entropía> repite la simulación
+    seed = option('seed', None, int)
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    print(f"{games} games  rules={rules}  X={x_policy}  O={o_policy}  seed={seed}")
+    simulate(games, rules, x_policy, o_policy, option('workers', None, int),
+             option('chunk', 20_000, int), seed, option('max-plies', MAX_PLIES, int))
@@ -0,0 +1,164 @@
+# Solver exacto para reglas con un número fijo de turnos (no Hardcore).
+#
+# El valor de una posición es el resultado esperado del colapso final con juego
+# óptimo: P(X won!) - P(O won!). X maximiza y O minimiza; el único azar es el colapso,
+# que en las hojas se evalúa de forma exacta con odds.py. Las posiciones se memorizan
+# por su hash canónico (transposition.py), así que las simétricas se resuelven una vez,
+# y la tabla se guarda en cache/ para no repetir el cálculo.
+#
+#   python solver.py [--max-turns=N] [--last-moves=N] [--o-starts]
+from os import makedirs
+from os.path import dirname, abspath, exists, join
+from sys import argv
+from time import perf_counter
+
+import numpy as np
+
+from models import HALF_POW, rules_model
+from odds import outcome_probs
+from qengine import STANDARD_RULES, Game, legal_cells
+
+CACHE_DIR = join(dirname(abspath(__file__)), 'cache')
+PREFETCH = 2  # a cuántos turnos del final se juntan las hojas para evaluarlas en bloque
+
+
+def leaf_values(boards, model=HALF_POW):
+    # P(X won!) - P(O won!) de cada tablero final
+    probs = outcome_probs(np.array(boards, dtype=np.int16), model)
+    return (probs[:, 1] - probs[:, 2]).tolist()
+
+
+class Solver:
+    def __init__(self, rules, cache=True):
+        self.xstart = rules['xstart']
+        self.max_turns = rules['max_turns']
+        self.last_moves = rules['last_moves']
+        self.model = rules_model(rules)
+        if rules.get('hardcore', False) or self.max_turns <= 0:
+            raise ValueError("the solver needs a fixed number of turns (Hardcore games are unbounded)")
+        self.memo = {}
+        self.nodes = self.leaves = 0
+        self.elapsed = 0.0
+        self.path = join(CACHE_DIR, self.cache_name()) if cache else None
+        if self.path and exists(self.path):
+            self.load(self.path)
+
+    def cache_name(self):
+        model = '' if self.model is HALF_POW else f"_{self.model.name}"
+        return f"solver_{'x' if self.xstart else 'o'}_{self.max_turns}_{self.last_moves}{model}.npz"
+
+    def window(self, log):
+        return tuple(reversed(log[-self.last_moves:])) if self.last_moves else ()
+
+    def children(self, codes, log, player, position):
+        # (celda, códigos, registro, hash) de cada jugada legal
+        old_window = self.window(log)
+        clock = self.max_turns - len(log)
+        for cell in legal_cells(codes, log, player, self.last_moves):
+            new = list(codes)
+            new[cell] = self.model.next[player][codes[cell]]
+            new_log = log + (cell,)
+            child = position.child(cell, codes[cell], new[cell], old_window, self.window(new_log), clock, clock - 1)
+            yield cell, tuple(new), new_log, child
+
+    def prefetch(self, codes, log, player, position, leaves):
+        # Junta las hojas (último turno) aún sin valor que cuelgan de esta posición
+        other = 'O' if player == 'X' else 'X'
+        for _, new_codes, new_log, child in self.children(codes, log, player, position):
+            if len(new_log) >= self.max_turns:
+                key = child.canonical()[0]
+                if key not in self.memo:
+                    leaves[key] = new_codes
+            else:
+                self.prefetch(new_codes, new_log, other, child, leaves)
+
+    def evaluate(self, leaves):
+        # Valor de muchas hojas en una sola llamada a outcome_probs (el coste fijo domina)
+        self.nodes += len(leaves)
+        self.leaves += len(leaves)
+        self.memo.update(zip(leaves.keys(), leaf_values(list(leaves.values()), self.model)))
+
+    def search(self, codes, log, player, position):
+        key = position.canonical()[0]
+        value = self.memo.get(key)
+        if value is not None:
+            return value
+        if len(log) == self.max_turns - PREFETCH:
+            leaves = {}
+            self.prefetch(codes, log, player, position, leaves)
+            if leaves:
+                self.evaluate(leaves)
+        self.nodes += 1
+        other = 'O' if player == 'X' else 'X'
+        best = max if player == 'X' else min
+        moves = list(self.children(codes, log, player, position))
+        if len(log) >= self.max_turns or not moves:
+            self.leaves += 1
+            value = leaf_values([codes], self.model)[0]
+        else:
+            value = best(self.search(new_codes, new_log, other, child) for _, new_codes, new_log, child in moves)
+        self.memo[key] = value
+        return value
+
+    def position(self, game):
+        codes = tuple(state.code for state in game.grid.flat)
+        log = tuple(3*row + col for row, col in game.moves_log)
+        return codes, log, game.turn.player, game.hash
+
+    def value(self, game):
+        # Valor exacto de la posición de `game` con juego óptimo de ambos
+        start = perf_counter()
+        value = self.search(*self.position(game))
+        self.elapsed += perf_counter() - start
+        return value
+
+    def best_move(self, game):
+        # ((fila, columna), valor) de la jugada óptima para quien mueve
+        codes, log, player, position = self.position(game)
+        other = 'O' if player == 'X' else 'X'
+        start = perf_counter()
+        scored = [(self.search(new_codes, new_log, other, child), cell)
+                  for cell, new_codes, new_log, child in self.children(codes, log, player, position)]
+        self.elapsed += perf_counter() - start
+        if not scored:
+            return None, self.value(game)
+        # Entre jugadas igual de buenas, la de celda más baja
+        value, cell = max(scored, key=lambda pair: (pair[0], -pair[1])) if player == 'X' else min(scored)
+        return divmod(cell, 3), value
+
+    def solve(self):
+        return self.value(Game({'xstart': self.xstart, 'max_turns': self.max_turns, 'last_moves': self.last_moves}))
+
+    def save(self, path=None):
+        path = path or self.path
+        makedirs(dirname(path), exist_ok=True)
+        keys = np.fromiter(self.memo.keys(), dtype=np.uint64, count=len(self.memo))
+        values = np.fromiter(self.memo.values(), dtype=np.float64, count=len(self.memo))
+        np.savez_compressed(path, keys=keys, values=values)
+
+    def load(self, path):
+        data = np.load(path)
+        self.memo.update(zip(data['keys'].tolist(), data['values'].tolist()))
+
+    def stats(self):
+        rate = self.nodes / self.elapsed if self.elapsed else 0.0
+        return (f"{self.nodes} nodes ({self.leaves} leaves) in {self.elapsed:.1f} s, "
+                f"{rate:,.0f} nodes/s, table {len(self.memo)} positions")
+
+
+if __name__ == "__main__":
+    rules = dict(STANDARD_RULES)
+    for arg in argv[1:]:
+        if arg.startswith('--max-turns='):
+            rules['max_turns'] = int(arg.split('=')[1])
+        elif arg.startswith('--last-moves='):
+            rules['last_moves'] = int(arg.split('=')[1])
+    rules['xstart'] = '--o-starts' not in argv
+    solver = Solver(rules)
+    known = len(solver.memo)
+    value = solver.solve()
+    print(f"rules={rules}  value (P(X won!) - P(O won!)) = {value:+.6f}")
+    print(solver.stats())
+    if len(solver.memo) > known:
+        solver.save()
+        print(f"saved {solver.path}")
@@ -0,0 +1,49 @@
+# Presupuesto de arranque: cuánto tarda cada import y cada fase de inicialización,
+# y el tiempo hasta el primer frame (python qgame_0.4.1.py --profile-startup)
+from contextlib import contextmanager
+from importlib import import_module
+from threading import Thread
+from time import perf_counter
+
+START = perf_counter()
+timings = []    # (fase, segundos) en el hilo principal
+prewarmed = []  # (módulo, segundos) importados en segundo plano
+first_frame_time = None
+
+
+@contextmanager
+def phase(label):
+    start = perf_counter()
+    yield
+    timings.append((label, perf_counter() - start))
+
+
+def prewarm(*names):
+    # Importa módulos pesados en segundo plano para que el primer uso no se note
+    def run():
+        for name in names:
+            start = perf_counter()
+            import_module(name)
+            prewarmed.append((name, perf_counter() - start))
+    Thread(target=run, name='prewarm', daemon=True).start()
+
+
+def first_frame():
+    # True solo la primera vez que se llama (el primer frame ya está en pantalla)
+    global first_frame_time
+    if first_frame_time is not None:
+        return False
+    first_frame_time = perf_counter() - START
+    return True
+
+
+def report():
+    print("startup (ms):")
+    for label, seconds in timings:
+        print(f"  {label:<28}{seconds * 1e3:8.1f}")
+    if first_frame_time is not None:
+        print(f"  {'time to first frame':<28}{first_frame_time * 1e3:8.1f}")
+    if prewarmed:
+        print("prewarmed in background (ms):")
+        for name, seconds in prewarmed:
+            print(f"  {name:<28}{seconds * 1e3:8.1f}")
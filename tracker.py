@@ -0,0 +1,47 @@
+# Probabilidades de cada línea mantenidas jugada a jugada. Cuando cambia una celda solo
+# se recalculan las 2-4 líneas que pasan por ella (CELL_LINES); el número esperado de
+# líneas de cada jugador es la suma de las 8 y se lee en O(1).
+from functools import lru_cache
+
+from bitboard import CELL_LINES, LINE_CELLS, RESULTS
+from dyadic import EMPTY
+from models import HALF_POW
+from odds import board_probs
+
+
+@lru_cache(maxsize=4096)
+def _board_odds(codes, model):
+    return tuple(board_probs(codes, model).tolist())
+
+
+class LineTracker:
+    def __init__(self, model=HALF_POW):
+        self.model = model  # modelo de peso de las celdas (models.py)
+        self.codes = [EMPTY] * 9
+        self.px = [0.0] * 9
+        self.po = [0.0] * 9
+        self.line_x = [0.0] * 8  # P(línea completa de X)
+        self.line_o = [0.0] * 8
+
+    def update(self, cell, code):
+        px = float(self.model.px[code])
+        self.codes[cell] = code
+        self.px[cell] = px
+        self.po[cell] = 0.0 if code == EMPTY else 1.0 - px
+        for line in CELL_LINES[cell]:
+            a, b, c = LINE_CELLS[line]
+            self.line_x[line] = self.px[a] * self.px[b] * self.px[c]
+            self.line_o[line] = self.po[a] * self.po[b] * self.po[c]
+
+    def expected_lines(self):
+        # (líneas de X esperadas, líneas de O esperadas)
+        return sum(self.line_x), sum(self.line_o)
+
+    def lead(self):
+        # Ventaja esperada de X en líneas: > 0 favorece a X
+        xlines, olines = self.expected_lines()
+        return xlines - olines
+
+    def odds(self):
+        # {'Tie': p, 'X won!': p, 'O won!': p} exactas; cada tablero se evalúa una sola vez
+        return dict(zip(RESULTS, _board_odds(tuple(self.codes), self.model)))
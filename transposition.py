@@ -0,0 +1,203 @@
+# Hash de Zobrist de una posición cuántica y tabla de transposición para las búsquedas.
+#
+# La posición es: el código de las 9 celdas, las últimas `last_moves` jugadas (en orden,
+# la más reciente primero: deciden qué celdas se congelan ahora y después), a quién le
+# toca y el reloj (turnos restantes; en Hardcore min(jugadas, last_moves), que es lo que
+# afecta a la ventana de congelación). Cada parte aporta claves de 64 bits que se
+# combinan con XOR, así que una jugada actualiza el hash en O(last_moves).
+#
+# Se mantienen a la vez los hashes de las 8 simetrías del tablero (D4); el canónico es
+# el menor y las posiciones simétricas comparten entrada en la tabla.
+from functools import lru_cache
+
+from dyadic import EMPTY
+
+MASK64 = (1 << 64) - 1
+
+# SYMMETRIES[s][celda] = celda imagen con la simetría s (celda = 3*fila + columna)
+SYMMETRIES = tuple(
+    tuple(3 * row + col for row, col in (transform(r, c) for r in range(3) for c in range(3)))
+    for transform in (
+        lambda r, c: (r, c),
+        lambda r, c: (c, 2 - r),          # giro de 90°
+        lambda r, c: (2 - r, 2 - c),      # giro de 180°
+        lambda r, c: (2 - c, r),          # giro de 270°
+        lambda r, c: (r, 2 - c),          # espejo horizontal
+        lambda r, c: (2 - r, c),          # espejo vertical
+        lambda r, c: (c, r),              # diagonal
+        lambda r, c: (2 - c, 2 - r),      # antidiagonal
+    )
+)
+INVERSE = tuple(tuple(perm.index(cell) for cell in range(9)) for perm in SYMMETRIES)
+
+
+def splitmix64(x):
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+@lru_cache(maxsize=None)
+def cell_key(cell, code):
+    return splitmix64(1 << 40 | cell << 16 | code & 0xFFFF)
+
+
+@lru_cache(maxsize=None)
+def window_key(slot, cell):
+    return splitmix64(2 << 40 | slot << 8 | cell)
+
+
+@lru_cache(maxsize=None)
+def clock_key(clock):
+    return splitmix64(3 << 40 | clock & 0xFFFF)
+
+
+SIDE_KEY = splitmix64(4 << 40)  # le toca a O
+NO_KEYS = (0,) * 8
+
+
+@lru_cache(maxsize=None)
+def cell_keys(cell, code):
+    # Clave de (celda, código) en cada una de las 8 simetrías
+    return tuple(cell_key(perm[cell], code) for perm in SYMMETRIES)
+
+
+@lru_cache(maxsize=1 << 16)
+def window_keys(window):
+    keys = [0] * 8
+    for s, perm in enumerate(SYMMETRIES):
+        for slot, cell in enumerate(window):
+            keys[s] ^= window_key(slot, perm[cell])
+    return tuple(keys)
+
+
+@lru_cache(maxsize=1 << 16)
+def cell_change(cell, old, new):
+    return tuple(a ^ b for a, b in zip(cell_keys(cell, old), cell_keys(cell, new)))
+
+
+@lru_cache(maxsize=1 << 16)
+def window_change(old, new):
+    return tuple(a ^ b for a, b in zip(window_keys(old), window_keys(new)))
+
+
+class PositionHash:
+    __slots__ = ('keys',)
+
+    def __init__(self, codes, window=(), o_to_move=False, clock=0):
+        # window: celdas de las últimas jugadas, la más reciente primero
+        self.keys = list(window_keys(tuple(window)))
+        for cell, code in enumerate(codes):
+            self.set_cell(cell, None, code)
+        self.keys = [key ^ clock_key(clock) ^ (SIDE_KEY if o_to_move else 0) for key in self.keys]
+
+    def copy(self):
+        new = PositionHash.__new__(PositionHash)
+        new.keys = self.keys[:]
+        return new
+
+    def set_cell(self, cell, old, new):
+        old = cell_keys(cell, old) if old is not None else NO_KEYS
+        self.keys = [key ^ a ^ b for key, a, b in zip(self.keys, old, cell_keys(cell, new))]
+
+    def set_window(self, old, new):
+        self.keys = [key ^ a ^ b for key, a, b in zip(self.keys, window_keys(tuple(old)), window_keys(tuple(new)))]
+
+    def set_clock(self, old, new):
+        change = clock_key(old) ^ clock_key(new)
+        self.keys = [key ^ change for key in self.keys]
+
+    def switch_side(self):
+        self.keys = [key ^ SIDE_KEY for key in self.keys]
+
+    def child(self, cell, old, new, old_window, new_window, old_clock, new_clock):
+        # Hash tras una jugada completa (celda, ventana, reloj y turno) en una sola pasada
+        change = clock_key(old_clock) ^ clock_key(new_clock) ^ SIDE_KEY
+        child = PositionHash.__new__(PositionHash)
+        child.keys = [key ^ a ^ b ^ change for key, a, b in zip(
+            self.keys, cell_change(cell, old, new), window_change(old_window, new_window))]
+        return child
+
+    @property
+    def key(self):
+        return self.keys[0]
+
+    def canonical(self):
+        # (hash canónico, simetría que lleva la posición a su forma canónica)
+        key = min(self.keys)
+        return key, self.keys.index(key)
+
+
+@lru_cache(maxsize=None)
+def _start_keys(o_to_move, clock):
+    return tuple(PositionHash([EMPTY] * 9, (), o_to_move, clock).keys)
+
+
+def start_hash(o_to_move, clock):
+    # Hash del tablero vacío (memorizado: se crea uno por partida)
+    new = PositionHash.__new__(PositionHash)
+    new.keys = list(_start_keys(o_to_move, clock))
+    return new
+
+
+def to_canonical(cell, symmetry):
+    return SYMMETRIES[symmetry][cell]
+
+
+def from_canonical(cell, symmetry):
+    return INVERSE[symmetry][cell]
+
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class TranspositionTable:
+    # Tabla acotada de 2 entradas por cubo: la primera se reemplaza solo por una
+    # búsqueda igual de profunda o más (depth-preferred) y la segunda siempre.
+    # Entrada: (clave, profundidad, valor, cota, jugada)
+    def __init__(self, size=1 << 20):
+        self.buckets = 1 << max(size // 2 - 1, 1).bit_length()
+        self.mask = self.buckets - 1
+        self.deep = [None] * self.buckets
+        self.recent = [None] * self.buckets
+        self.probes = self.hits = self.stores = self.replaced = 0
+
+    def probe(self, key):
+        self.probes += 1
+        index = key & self.mask
+        for entry in (self.deep[index], self.recent[index]):
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry
+        return None
+
+    def store(self, key, depth, value, bound=EXACT, move=None):
+        self.stores += 1
+        index = key & self.mask
+        entry = (key, depth, value, bound, move)
+        deep = self.deep[index]
+        if deep is None or deep[0] == key or depth >= deep[1]:
+            if deep is not None and deep[0] != key:
+                self.replaced += 1
+                self.recent[index] = deep  # la desplazada aún puede servir
+            self.deep[index] = entry
+        else:
+            if self.recent[index] is not None and self.recent[index][0] != key:
+                self.replaced += 1
+            self.recent[index] = entry
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def __len__(self):
+        return sum(entry is not None for entry in self.deep) + sum(entry is not None for entry in self.recent)
+
+    def clear(self):
+        self.deep = [None] * self.buckets
+        self.recent = [None] * self.buckets
+        self.probes = self.hits = self.stores = self.replaced = 0
+
+    def __str__(self):
+        return (f"{type(self).__name__}: {len(self)}/{2 * self.buckets} entries, "
+                f"{self.probes} probes, {100 * self.hit_rate():.1f}% hits, {self.replaced} replaced")